@@ -10,6 +10,14 @@ from app.utils.cache import cache_result, get_cached_result
 
 logger = structlog.get_logger()
 
+# Conversion tracking snippets, compiled once and matched against page HTML
+CONVERSION_TRACKING_PATTERNS = {
+    "Google Ads Conversion": re.compile(r'gtag.*conversion', re.I),
+    "Facebook Conversion API": re.compile(r'fbq.*purchase|fbq.*lead', re.I),
+    "Enhanced Ecommerce": re.compile(r'enhanced.?ecommerce|ec:addproduct', re.I),
+    "Goal Tracking": re.compile(r'goal.*tracking|track.*goal', re.I)
+}
+
 
 class AdsAnalyzer:
     """Analyzes paid advertising presence and strategies"""
@@ -118,15 +126,8 @@ class AdsAnalyzer:
                         results["ad_platforms_detected"].append(platform)
                 
                 # Conversion tracking detection
-                conversion_patterns = {
-                    "Google Ads Conversion": 'gtag.*conversion',
-                    "Facebook Conversion API": 'fbq.*purchase|fbq.*lead',
-                    "Enhanced Ecommerce": 'enhanced.?ecommerce|ec:addproduct',
-                    "Goal Tracking": 'goal.*tracking|track.*goal'
-                }
-                
-                for tracker, pattern in conversion_patterns.items():
-                    if re.search(pattern, text, re.I):
+                for tracker, pattern in CONVERSION_TRACKING_PATTERNS.items():
+                    if pattern.search(text):
                         results["conversion_tracking"].append(tracker)
                 
         except Exception as e:
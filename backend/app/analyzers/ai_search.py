@@ -1,15 +1,26 @@
+import asyncio
 import httpx
+import orjson
 import re
 from typing import Dict, Any, List, Optional
 from bs4 import BeautifulSoup
 import structlog
+from selectolax.lexbor import LexborHTMLParser
 from urllib.parse import urljoin, urlparse
 
 from app.config import settings
 from app.utils.cache import cache_result, get_cached_result
+from app.utils.http_client import fetch_robots_txt, get_http_client
 
 logger = structlog.get_logger()
 
+# A robots.txt group: consecutive user-agent lines plus the rules up to the next group
+_ROBOTS_GROUP_RE = re.compile(
+    r'((?:^[ \t]*user-agent:[^\n]*(?:\n|$))+)((?:^(?![ \t]*user-agent:)[^\n]*(?:\n|$))*)',
+    re.MULTILINE
+)
+_USER_AGENT_RE = re.compile(r'user-agent:\s*([^\s#]+)')
+
 
 class AISearchAnalyzer:
     """
@@ -64,25 +75,27 @@ class AISearchAnalyzer:
         }
         
         try:
-            async with httpx.AsyncClient() as client:
-                # Check robots.txt for AI crawler access
-                await self._check_robots_txt(domain, client, results)
-                
-                # Check for llms.txt (new standard for AI instructions)
-                await self._check_llms_txt(domain, client, results)
-                
-                # Analyze homepage for AI-friendly content
-                await self._analyze_content_structure(domain, client, results)
-                
-                # Check schema markup
-                await self._analyze_schema_markup(domain, client, results)
-                
-                # Generate AI-specific recommendations
-                await self._generate_ai_recommendations(domain, results)
-                
-                # Calculate overall AI visibility score
-                self._calculate_ai_score(results)
-                
+            client = get_http_client()
+            # Robots.txt, llms.txt (new standard for AI instructions),
+            # homepage content structure and schema markup are independent
+            # fetches that fill separate keys, so run them concurrently
+            checks = {
+                "robots_txt": self._check_robots_txt(domain, client, results),
+                "llms_txt": self._check_llms_txt(domain, client, results),
+                "content_structure": self._analyze_content_structure(domain, client, results),
+                "schema_markup": self._analyze_schema_markup(domain, client, results),
+            }
+            outcomes = await asyncio.gather(*checks.values(), return_exceptions=True)
+            for check_name, outcome in zip(checks, outcomes):
+                if isinstance(outcome, Exception):
+                    logger.error(f"AI search {check_name} check failed for {domain}", error=str(outcome))
+            
+            # Generate AI-specific recommendations
+            await self._generate_ai_recommendations(domain, results)
+            
+            # Calculate overall AI visibility score
+            self._calculate_ai_score(results)
+            
             await cache_result(cache_key, results, ttl=86400)
             
         except Exception as e:
@@ -93,42 +106,38 @@ class AISearchAnalyzer:
     async def _check_robots_txt(self, domain: str, client: httpx.AsyncClient, results: Dict) -> None:
         """Check robots.txt for AI crawler permissions"""
         try:
-            response = await client.get(f"https://{domain}/robots.txt", timeout=10.0)
-            if response.status_code == 200:
-                robots_content = response.text.lower()
+            robots_content = await fetch_robots_txt(domain)
+            if robots_content is not None:
+                # Single sweep: map each user-agent to whether its group disallows
+                agent_blocked = {}
+                for group in _ROBOTS_GROUP_RE.finditer(robots_content):
+                    blocked = "disallow: /" in group.group(2)
+                    for agent in _USER_AGENT_RE.findall(group.group(1)):
+                        agent_blocked[agent] = agent_blocked.get(agent, False) or blocked
+                wildcard_blocked = agent_blocked.get("*", False)
                 
                 for crawler, name in self.AI_CRAWLERS.items():
                     crawler_lower = crawler.lower()
                     
                     # Check if crawler is explicitly blocked
-                    if f"user-agent: {crawler_lower}" in robots_content:
-                        # Look for disallow directive after this user-agent
-                        lines = robots_content.split('\n')
-                        for i, line in enumerate(lines):
-                            if f"user-agent: {crawler_lower}" in line:
-                                # Check next few lines for disallow
-                                for j in range(i+1, min(i+5, len(lines))):
-                                    if "disallow: /" in lines[j]:
-                                        results["blocked_crawlers"].append({
-                                            "bot": crawler,
-                                            "platform": name,
-                                            "impact": "high"
-                                        })
-                                        break
-                                    elif "user-agent:" in lines[j]:
-                                        # Next user-agent section, not blocked
-                                        results["allowed_crawlers"].append(crawler)
-                                        break
-                    
-                    # Check for wildcard blocking
-                    elif "user-agent: *" in robots_content and "disallow: /" in robots_content:
-                        # All bots blocked by default
-                        if crawler_lower not in robots_content:
+                    if crawler_lower in agent_blocked:
+                        if agent_blocked[crawler_lower]:
                             results["blocked_crawlers"].append({
                                 "bot": crawler,
                                 "platform": name,
                                 "impact": "high"
                             })
+                        else:
+                            results["allowed_crawlers"].append(crawler)
+                    
+                    # Check for wildcard blocking
+                    elif wildcard_blocked:
+                        # All bots blocked by default
+                        results["blocked_crawlers"].append({
+                            "bot": crawler,
+                            "platform": name,
+                            "impact": "high"
+                        })
                 
         except Exception as e:
             logger.error(f"Failed to check robots.txt for {domain}", error=str(e))
@@ -136,7 +145,7 @@ class AISearchAnalyzer:
     async def _check_llms_txt(self, domain: str, client: httpx.AsyncClient, results: Dict) -> None:
         """Check for llms.txt file (AI-specific instructions)"""
         try:
-            response = await client.get(f"https://{domain}/llms.txt", timeout=5.0)
+            response = await client.get(f"https://{domain}/llms.txt", timeout=5.0, follow_redirects=False)
             if response.status_code == 200:
                 results["has_llms_txt"] = True
                 content = response.text[:500]  # First 500 chars
@@ -231,16 +240,17 @@ class AISearchAnalyzer:
         """Check for schema markup that helps AI understanding"""
         try:
             response = await client.get(f"https://{domain}", timeout=10.0, follow_redirects=True)
-            soup = BeautifulSoup(response.text, 'lxml')
+            tree = LexborHTMLParser(response.text)
             
             schema_found = []
             
             # Check for JSON-LD schema
-            json_ld_scripts = soup.find_all('script', type='application/ld+json')
-            for script in json_ld_scripts:
+            for script in tree.css('script[type="application/ld+json"]'):
+                raw = script.text()
+                if not raw:
+                    continue
                 try:
-                    import json
-                    schema_data = json.loads(script.string)
+                    schema_data = orjson.loads(raw)
                     if isinstance(schema_data, dict):
                         schema_type = schema_data.get('@type', '')
                         if schema_type:
@@ -255,9 +265,8 @@ class AISearchAnalyzer:
                     continue
             
             # Check for microdata
-            microdata_items = soup.find_all(attrs={'itemscope': True})
-            for item in microdata_items:
-                item_type = item.get('itemtype', '')
+            for item in tree.css('[itemscope]'):
+                item_type = item.attributes.get('itemtype') or ''
                 if 'schema.org' in item_type:
                     schema_type = item_type.split('/')[-1]
                     schema_found.append(schema_type)
@@ -13,6 +13,9 @@ from app.core.ai_providers import AIProviderFactory
 
 logger = structlog.get_logger()
 
+# Homepage heading keywords are words of four or more letters
+_HEADING_WORD_RE = re.compile(r'\b[a-zA-Z]{4,}\b')
+
 
 class CompetitorAnalyzer:
     def __init__(self):
@@ -190,14 +193,10 @@ class CompetitorAnalyzer:
                         analysis["description"] = first_p.get_text(strip=True)[:200]
                 
                 # Extract keywords from headings
-                headings = soup.find_all(['h1', 'h2', 'h3'])[:10]
-                keywords = []
-                for h in headings:
-                    text = h.get_text(strip=True)
-                    # Extract meaningful words
-                    words = re.findall(r'\b[a-zA-Z]{4,}\b', text)
-                    keywords.extend(words)
-                analysis["keywords"] = list(set(keywords))[:20]
+                headings = soup.find_all(['h1', 'h2', 'h3'], limit=10)
+                # Extract meaningful words with one scan over all heading text
+                heading_text = ' '.join(h.get_text(strip=True) for h in headings)
+                analysis["keywords"] = list(set(_HEADING_WORD_RE.findall(heading_text)))[:20]
                 
                 # Detect features with more granular detection
                 if "free trial" in content or "try free" in content or "start free" in content:
@@ -3,17 +3,19 @@ Content quality analyzer that evaluates if content is actually effective
 Goes beyond checking if content exists to evaluate its quality and impact
 """
 
+import asyncio
 import httpx
 from typing import Dict, Any, List, Optional
 import re
 import structlog
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from textstat import flesch_reading_ease, flesch_kincaid_grade
 import nltk
 from collections import Counter
 from urllib.parse import urljoin
 
 from app.utils.cache import cache_result, get_cached_result
+from app.utils.http_client import get_http_client
 
 logger = structlog.get_logger()
 
@@ -23,6 +25,34 @@ try:
 except LookupError:
     nltk.download('punkt', quiet=True)
 
+# Industry jargon that confuses visitors
+JARGON_TERMS = frozenset({
+    "synergy", "leverage", "paradigm", "holistic", "disruptive",
+    "revolutionary", "cutting-edge", "next-generation", "best-in-class",
+    "turnkey", "scalable", "robust", "seamless", "innovative",
+    "enterprise-grade", "world-class", "leading", "premier",
+    "state-of-the-art", "breakthrough", "transformative"
+})
+
+# Power words that convert
+POWER_WORDS = frozenset({
+    "free", "instant", "easy", "simple", "proven", "guaranteed",
+    "exclusive", "limited", "new", "save", "you", "your",
+    "imagine", "discover", "unlock", "transform", "boost",
+    "results", "success", "grow", "increase", "improve"
+})
+
+# Trust words
+TRUST_WORDS = frozenset({
+    "trusted", "secure", "safe", "certified", "verified",
+    "guaranteed", "proven", "authentic", "reliable", "established"
+})
+
+# Simple passive voice heuristic
+PASSIVE_INDICATORS = frozenset({"was", "were", "been", "being", "be", "is", "are"})
+
+WEAK_CTAS = frozenset({"submit", "click here", "learn more", "read more", "continue"})
+
 
 class ContentQualityAnalyzer:
     """
@@ -38,29 +68,6 @@ class ContentQualityAnalyzer:
     
     def __init__(self):
         self.timeout = httpx.Timeout(20.0, connect=10.0)
-        
-        # Industry jargon that confuses visitors
-        self.jargon_terms = {
-            "synergy", "leverage", "paradigm", "holistic", "disruptive",
-            "revolutionary", "cutting-edge", "next-generation", "best-in-class",
-            "turnkey", "scalable", "robust", "seamless", "innovative",
-            "enterprise-grade", "world-class", "leading", "premier",
-            "state-of-the-art", "breakthrough", "transformative"
-        }
-        
-        # Power words that convert
-        self.power_words = {
-            "free", "instant", "easy", "simple", "proven", "guaranteed",
-            "exclusive", "limited", "new", "save", "you", "your",
-            "imagine", "discover", "unlock", "transform", "boost",
-            "results", "success", "grow", "increase", "improve"
-        }
-        
-        # Trust words
-        self.trust_words = {
-            "trusted", "secure", "safe", "certified", "verified",
-            "guaranteed", "proven", "authentic", "reliable", "established"
-        }
     
     async def analyze(self, domain: str) -> Dict[str, Any]:
         """
@@ -86,39 +93,37 @@ class ContentQualityAnalyzer:
         }
         
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                # Analyze key pages
-                pages = await self._get_key_pages(domain, client)
-                
-                page_analyses = {}
-                for page_name, url in pages.items():
-                    if url:
-                        page_analysis = await self._analyze_page_content(
-                            url, page_name, client
-                        )
-                        page_analyses[page_name] = page_analysis
-                
-                # Aggregate results
-                results["readability_issues"] = self._aggregate_readability(page_analyses)
-                results["value_prop_clarity"] = self._assess_value_prop(page_analyses)
-                results["jargon_analysis"] = self._analyze_jargon_usage(page_analyses)
-                results["cta_effectiveness"] = self._evaluate_ctas(page_analyses)
-                results["social_proof_quality"] = self._assess_social_proof(page_analyses)
-                results["emotional_triggers"] = self._analyze_emotional_appeal(page_analyses)
-                results["content_freshness"] = await self._check_content_freshness(pages, client)
-                
-                # Calculate overall score
-                results["overall_quality_score"] = self._calculate_quality_score(results)
-                
-                # Generate improvement priorities
-                results["improvement_priorities"] = self._prioritize_improvements(results)
-                results["quick_content_wins"] = self._identify_quick_wins(results)
-                
-                # Compare to best practices
-                results["competitor_comparison"] = self._compare_to_best_practices(results)
-                
-                # Cache for 24 hours
-                await cache_result(cache_key, results, ttl=86400)
+            client = get_http_client()
+            # Analyze key pages concurrently over the shared connection pool
+            pages = await self._get_key_pages(domain, client)
+            
+            analyses = await asyncio.gather(*(
+                self._analyze_page_content(url, page_name, client)
+                for page_name, url in pages.items()
+            ))
+            page_analyses = dict(zip(pages, analyses))
+            
+            # Aggregate results
+            results["readability_issues"] = self._aggregate_readability(page_analyses)
+            results["value_prop_clarity"] = self._assess_value_prop(page_analyses)
+            results["jargon_analysis"] = self._analyze_jargon_usage(page_analyses)
+            results["cta_effectiveness"] = self._evaluate_ctas(page_analyses)
+            results["social_proof_quality"] = self._assess_social_proof(page_analyses)
+            results["emotional_triggers"] = self._analyze_emotional_appeal(page_analyses)
+            results["content_freshness"] = await self._check_content_freshness(pages, client)
+            
+            # Calculate overall score
+            results["overall_quality_score"] = self._calculate_quality_score(results)
+            
+            # Generate improvement priorities
+            results["improvement_priorities"] = self._prioritize_improvements(results)
+            results["quick_content_wins"] = self._identify_quick_wins(results)
+            
+            # Compare to best practices
+            results["competitor_comparison"] = self._compare_to_best_practices(results)
+            
+            # Cache for 24 hours
+            await cache_result(cache_key, results, ttl=86400)
         
         except Exception as e:
             logger.error(f"Content quality analysis failed for {domain}", error=str(e))
@@ -137,9 +142,10 @@ class ContentQualityAnalyzer:
         }
         
         try:
-            response = await client.get(pages["homepage"], follow_redirects=True)
+            response = await client.get(pages["homepage"], timeout=self.timeout, follow_redirects=True)
             if response.status_code == 200:
-                soup = BeautifulSoup(response.text, 'html.parser')
+                # Only links are needed here, so skip building the rest of the tree
+                soup = BeautifulSoup(response.text, 'html.parser', parse_only=SoupStrainer('a', href=True))
                 
                 for link in soup.find_all('a', href=True):
                     href = link['href'].lower()
@@ -175,45 +181,56 @@ class ContentQualityAnalyzer:
         }
         
         try:
-            response = await client.get(url, follow_redirects=True)
+            response = await client.get(url, timeout=self.timeout, follow_redirects=True)
             if response.status_code == 200:
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
-                # Extract text content
-                for script in soup(["script", "style"]):
-                    script.decompose()
-                text = soup.get_text()
-                
-                # Clean text
-                lines = (line.strip() for line in text.splitlines())
-                chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-                text = ' '.join(chunk for chunk in chunks if chunk)
-                
-                # Analyze readability
-                analysis["readability"] = self._analyze_readability(text)
-                
-                # Analyze jargon
-                analysis["jargon"] = self._calculate_jargon_density(text)
-                
-                # Analyze value proposition (homepage and features pages)
-                if page_name in ["homepage", "features"]:
-                    analysis["value_prop"] = self._analyze_value_proposition(soup, text)
-                
-                # Analyze CTAs
-                analysis["ctas"] = self._analyze_cta_quality(soup)
-                
-                # Analyze social proof
-                analysis["social_proof"] = self._analyze_social_proof(soup, text)
-                
-                # Analyze emotional appeal
-                analysis["emotional_appeal"] = self._analyze_emotions(text)
+                # Parsing and text analysis are CPU-bound; keep them off the event loop
+                await asyncio.to_thread(self._analyze_page_html, response.text, page_name, analysis)
         
         except Exception as e:
             logger.debug(f"Error analyzing page {url}: {e}")
         
         return analysis
     
-    def _analyze_readability(self, text: str) -> Dict[str, Any]:
+    def _analyze_page_html(self, html: str, page_name: str, analysis: Dict[str, Any]) -> None:
+        """Fill in the content analyses for one fetched page"""
+        soup = BeautifulSoup(html, 'html.parser')
+        
+        # Extract text content
+        for script in soup(["script", "style"]):
+            script.decompose()
+        text = soup.get_text()
+        
+        # Clean text
+        lines = (line.strip() for line in text.splitlines())
+        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+        text = ' '.join(chunk for chunk in chunks if chunk)
+        
+        # Tokenize once and share across the word-level analyses
+        text_lower = text.lower()
+        words = text_lower.split()
+        word_freq = Counter(words)
+        total_words = len(words)
+        
+        # Analyze readability
+        analysis["readability"] = self._analyze_readability(text, word_freq, total_words)
+        
+        # Analyze jargon
+        analysis["jargon"] = self._calculate_jargon_density(word_freq, total_words)
+        
+        # Analyze value proposition (homepage and features pages)
+        if page_name in ["homepage", "features"]:
+            analysis["value_prop"] = self._analyze_value_proposition(soup, text)
+        
+        # Analyze CTAs
+        analysis["ctas"] = self._analyze_cta_quality(soup)
+        
+        # Analyze social proof
+        analysis["social_proof"] = self._analyze_social_proof(soup, text)
+        
+        # Analyze emotional appeal
+        analysis["emotional_appeal"] = self._analyze_emotions(text_lower, word_freq, total_words)
+    
+    def _analyze_readability(self, text: str, word_freq: Counter, total_words: int) -> Dict[str, Any]:
         """Analyze text readability and complexity"""
         if len(text) < 100:
             return {"error": "Not enough text to analyze"}
@@ -248,9 +265,8 @@ class ContentQualityAnalyzer:
             avg_sentence_length = sum(len(s.split()) for s in sentences) / len(sentences)
             
             # Check for passive voice (simple heuristic)
-            passive_indicators = ["was", "were", "been", "being", "be", "is", "are"]
-            passive_count = sum(1 for word in text.lower().split() if word in passive_indicators)
-            passive_percentage = (passive_count / len(text.split())) * 100
+            passive_count = sum(word_freq[word] for word in PASSIVE_INDICATORS)
+            passive_percentage = (passive_count / total_words) * 100
             
             return {
                 "flesch_score": flesch_score,
@@ -267,21 +283,15 @@ class ContentQualityAnalyzer:
         except Exception as e:
             return {"error": f"Readability analysis failed: {e}"}
     
-    def _calculate_jargon_density(self, text: str) -> Dict[str, Any]:
+    def _calculate_jargon_density(self, word_freq: Counter, total_words: int) -> Dict[str, Any]:
         """Calculate how much jargon is used"""
-        words = text.lower().split()
-        total_words = len(words)
-        
         if total_words < 50:
             return {"error": "Not enough text"}
         
         # Count jargon usage
-        jargon_found = []
-        for word in words:
-            if word in self.jargon_terms:
-                jargon_found.append(word)
+        jargon_found = Counter({word: count for word, count in word_freq.items() if word in JARGON_TERMS})
         
-        jargon_count = len(jargon_found)
+        jargon_count = jargon_found.total()
         jargon_density = (jargon_count / total_words) * 100
         
         # Determine severity
@@ -301,7 +311,7 @@ class ContentQualityAnalyzer:
             "total_words": total_words,
             "severity": severity,
             "impact": impact,
-            "top_jargon": Counter(jargon_found).most_common(5),
+            "top_jargon": jargon_found.most_common(5),
             "fix": "Replace with simple, concrete language"
         }
     
@@ -320,11 +330,12 @@ class ContentQualityAnalyzer:
         
         if headlines:
             main_headline = headlines[0].get_text()
+            headline_lower = main_headline.lower()
             analysis["has_clear_headline"] = True
             
             # Check if headline is specific
             vague_words = ["solution", "platform", "software", "tool", "system"]
-            if any(word in main_headline.lower() for word in vague_words):
+            if any(word in headline_lower for word in vague_words):
                 analysis["issues"].append({
                     "type": "vague_headline",
                     "current": main_headline[:100],
@@ -334,7 +345,7 @@ class ContentQualityAnalyzer:
             
             # Check if benefit-focused
             benefit_words = ["increase", "reduce", "save", "grow", "improve", "boost", "get"]
-            analysis["benefit_focused"] = any(word in main_headline.lower() for word in benefit_words)
+            analysis["benefit_focused"] = any(word in headline_lower for word in benefit_words)
             
             if not analysis["benefit_focused"]:
                 analysis["issues"].append({
@@ -362,7 +373,8 @@ class ContentQualityAnalyzer:
         
         # Check for differentiation
         diff_words = ["unlike", "instead of", "better than", "only", "first"]
-        analysis["differentiation"] = any(word in text[:1000].lower() for word in diff_words)
+        intro_lower = text[:1000].lower()
+        analysis["differentiation"] = any(word in intro_lower for word in diff_words)
         
         if not analysis["differentiation"]:
             analysis["issues"].append({
@@ -383,6 +395,7 @@ class ContentQualityAnalyzer:
         for button in buttons[:10]:  # Analyze first 10
             text = button.get_text().strip()
             if text:
+                cta_lower = text.lower()
                 cta_analysis = {
                     "text": text,
                     "quality": self._rate_cta_text(text),
@@ -390,8 +403,7 @@ class ContentQualityAnalyzer:
                 }
                 
                 # Check for weak CTAs
-                weak_ctas = ["submit", "click here", "learn more", "read more", "continue"]
-                if text.lower() in weak_ctas:
+                if cta_lower in WEAK_CTAS:
                     cta_analysis["issues"].append("Weak, generic CTA")
                 
                 # Check length
@@ -399,7 +411,7 @@ class ContentQualityAnalyzer:
                     cta_analysis["issues"].append("Too long (>5 words)")
                 
                 # Check for value
-                if not any(word in text.lower() for word in ["get", "start", "try", "free"]):
+                if not any(word in cta_lower for word in ["get", "start", "try", "free"]):
                     cta_analysis["issues"].append("No value proposition")
                 
                 ctas.append(cta_analysis)
@@ -521,7 +533,7 @@ class ContentQualityAnalyzer:
         
         return analysis
     
-    def _analyze_emotions(self, text: str) -> Dict[str, Any]:
+    def _analyze_emotions(self, text_lower: str, word_freq: Counter, total_words: int) -> Dict[str, Any]:
         """Analyze emotional triggers in content"""
         analysis = {
             "power_word_density": 0,
@@ -532,31 +544,28 @@ class ContentQualityAnalyzer:
             "effectiveness": "low"
         }
         
-        words = text.lower().split()
-        total_words = len(words)
-        
         if total_words < 100:
             return analysis
         
         # Count power words
-        power_count = sum(1 for word in words if word in self.power_words)
+        power_count = sum(word_freq[word] for word in POWER_WORDS)
         analysis["power_word_density"] = (power_count / total_words) * 100
         
         # Count trust words
-        trust_count = sum(1 for word in words if word in self.trust_words)
+        trust_count = sum(word_freq[word] for word in TRUST_WORDS)
         analysis["trust_word_density"] = (trust_count / total_words) * 100
         
         # Urgency indicators
         urgency_words = ["now", "today", "limited", "ends", "hurry", "last chance"]
-        analysis["urgency_indicators"] = sum(1 for word in urgency_words if word in text.lower())
+        analysis["urgency_indicators"] = sum(1 for word in urgency_words if word in text_lower)
         
         # Fear appeals (loss aversion)
         fear_phrases = ["don't miss", "avoid", "prevent", "stop losing", "risk"]
-        analysis["fear_appeals"] = sum(1 for phrase in fear_phrases if phrase in text.lower())
+        analysis["fear_appeals"] = sum(1 for phrase in fear_phrases if phrase in text_lower)
         
         # Aspiration appeals
         aspiration_phrases = ["achieve", "become", "transform", "unlock", "reach"]
-        analysis["aspiration_appeals"] = sum(1 for phrase in aspiration_phrases if phrase in text.lower())
+        analysis["aspiration_appeals"] = sum(1 for phrase in aspiration_phrases if phrase in text_lower)
         
         # Determine effectiveness
         total_emotional_elements = (
@@ -587,7 +596,7 @@ class ContentQualityAnalyzer:
         for page_name, url in pages.items():
             if url and "blog" in page_name:
                 try:
-                    response = await client.get(url, follow_redirects=True)
+                    response = await client.get(url, timeout=self.timeout, follow_redirects=True)
                     if response.status_code == 200:
                         soup = BeautifulSoup(response.text, 'html.parser')
                         
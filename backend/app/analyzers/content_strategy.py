@@ -1,16 +1,44 @@
+import asyncio
+import hashlib
 import httpx
 import re
-from typing import Dict, Any, List, Optional, Set
-from bs4 import BeautifulSoup
+from typing import Dict, Any, List, Optional, Set, Tuple
+from selectolax.lexbor import LexborHTMLParser, LexborNode
 import structlog
 from collections import Counter
 from urllib.parse import urljoin, urlparse
 
 from app.config import settings
 from app.utils.cache import cache_result, get_cached_result
+from app.utils.http_client import fetch_capped
 
 logger = structlog.get_logger()
 
+# Words ignored when extracting topics from post titles
+STOP_WORDS = frozenset({'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
+                        'of', 'with', 'by', 'from', 'is', 'are', 'was', 'were', 'been'})
+
+# Topic words are 4+ letters; stop words of that length are rejected by the
+# regex itself so titles need no per-word filtering afterwards
+_TOPIC_WORD_RE = re.compile(
+    r'\b(?!(?:' + '|'.join(sorted(w for w in STOP_WORDS if len(w) >= 4)) + r')\b)[a-z]{4,}\b'
+)
+
+# httpx timeouts apply per read, so a host trickling bytes could hold a fetch
+# (and the competitor gather waiting on it) open indefinitely; cap the whole fetch
+PAGE_FETCH_DEADLINE = 30.0
+
+# AI pillars only change when the homepage or topics do, so they outlive
+# the per-domain report cache
+CONTENT_PILLARS_TTL = 604800
+
+_INFOGRAPHIC_ALT_RE = re.compile(r'infographic|chart|graph', re.I)
+
+
+def _first_descendant(node: LexborNode, selector: str) -> Optional[LexborNode]:
+    """First match strictly inside node; lexbor's css() also matches the node itself"""
+    return next((match for match in node.css(selector) if match != node), None)
+
 
 class ContentStrategyAnalyzer:
     """
@@ -29,6 +57,12 @@ class ContentStrategyAnalyzer:
         "faq": ["faq", "questions", "answers", "q&a", "asked"]
     }
     
+    # One keyword alternation per content type, kept in priority order
+    CONTENT_TYPE_PATTERNS = tuple(
+        (content_type, re.compile('|'.join(re.escape(keyword) for keyword in keywords)))
+        for content_type, keywords in CONTENT_TYPES.items()
+    )
+    
     # Buyer journey stages
     BUYER_STAGES = {
         "awareness": ["what is", "how to", "guide", "tutorial", "learn"],
@@ -37,7 +71,7 @@ class ContentStrategyAnalyzer:
     }
     
     def __init__(self):
-        self.client = None
+        self.timeout = 20.0
         self.openai_client = None
         if settings.OPENAI_API_KEY:
             from openai import AsyncOpenAI
@@ -62,46 +96,48 @@ class ContentStrategyAnalyzer:
         }
         
         try:
-            async with httpx.AsyncClient(timeout=20.0, follow_redirects=True) as client:
-                self.client = client
-                
-                # Analyze current content
-                current_content = await self._analyze_current_content(domain)
-                results["current_content"] = current_content
-                
-                # Analyze competitor content if provided
-                if competitor_domains:
-                    competitor_content = await self._analyze_competitor_content(competitor_domains[:3])
-                    results["competitor_content"] = competitor_content
-                    
-                    # Identify content gaps
-                    results["content_gaps"] = self._identify_content_gaps(
-                        current_content,
-                        competitor_content
-                    )
-                
-                # Generate content pillars based on business focus
-                results["content_pillars"] = await self._generate_content_pillars(
-                    domain,
-                    current_content
-                )
+            # The homepage feeds both the content audit and the pillar prompt;
+            # fetch and parse it once
+            homepage = await self._fetch_homepage(domain)
+            
+            # Analyze current content
+            current_content = await self._analyze_current_content(domain, homepage)
+            results["current_content"] = current_content
+            
+            # Analyze competitor content if provided
+            if competitor_domains:
+                competitor_content = await self._analyze_competitor_content(competitor_domains[:3])
+                results["competitor_content"] = competitor_content
                 
-                # Generate specific topic recommendations
-                results["topic_recommendations"] = await self._generate_topic_recommendations(
-                    domain,
+                # Identify content gaps
+                results["content_gaps"] = self._identify_content_gaps(
                     current_content,
-                    results["content_gaps"]
+                    competitor_content
                 )
-                
-                # Analyze buyer journey coverage
-                results["buyer_journey_coverage"] = self._analyze_buyer_journey(current_content)
-                
-                # Calculate content score
-                results["content_score"] = self._calculate_content_score(current_content, results)
-                
-                # Generate opportunities
-                results["content_opportunities"] = self._generate_opportunities(results)
-                
+            
+            # Generate content pillars based on business focus
+            results["content_pillars"] = await self._generate_content_pillars(
+                domain,
+                current_content,
+                homepage
+            )
+            
+            # Generate specific topic recommendations
+            results["topic_recommendations"] = await self._generate_topic_recommendations(
+                domain,
+                current_content,
+                results["content_gaps"]
+            )
+            
+            # Analyze buyer journey coverage
+            results["buyer_journey_coverage"] = self._analyze_buyer_journey(current_content)
+            
+            # Calculate content score
+            results["content_score"] = self._calculate_content_score(current_content, results)
+            
+            # Generate opportunities
+            results["content_opportunities"] = self._generate_opportunities(results)
+            
             await cache_result(cache_key, results, ttl=86400)
             
         except Exception as e:
@@ -109,7 +145,34 @@ class ContentStrategyAnalyzer:
         
         return results
     
-    async def _analyze_current_content(self, domain: str) -> Dict[str, Any]:
+    async def _safe_fetch_page(self, url: str) -> Optional[Tuple[int, str]]:
+        """Fetch a page within PAGE_FETCH_DEADLINE, returning None on timeout or network error"""
+        try:
+            status_code, body, encoding = await asyncio.wait_for(
+                fetch_capped(url, timeout=self.timeout), PAGE_FETCH_DEADLINE
+            )
+        except (asyncio.TimeoutError, httpx.HTTPError) as e:
+            logger.warning("Content page fetch failed", url=url, error=str(e) or type(e).__name__)
+            return None
+        return status_code, body.decode(encoding, errors='replace')
+    
+    async def _fetch_homepage(self, domain: str) -> Optional[Tuple[LexborHTMLParser, str]]:
+        """Fetch the homepage once, returning its parsed tree and lowercased HTML"""
+        try:
+            page = await self._safe_fetch_page(f"https://{domain}")
+            if page is None:
+                return None
+            _, html = page
+            return LexborHTMLParser(html), html.lower()
+        except Exception as e:
+            logger.error(f"Failed to fetch homepage for {domain}", error=str(e))
+            return None
+    
+    async def _analyze_current_content(
+        self,
+        domain: str,
+        homepage: Optional[Tuple[LexborHTMLParser, str]]
+    ) -> Dict[str, Any]:
         """Analyze existing content on the website"""
         content_analysis = {
             "total_pages": 0,
@@ -138,15 +201,18 @@ class ContentStrategyAnalyzer:
             
             for blog_url in blog_urls:
                 try:
-                    response = await self.client.get(blog_url)
-                    if response.status_code == 200:
+                    page = await self._safe_fetch_page(blog_url)
+                    if page is None:
+                        continue
+                    status_code, html = page
+                    if status_code == 200:
                         blog_found = True
                         content_analysis["has_blog"] = True
                         
-                        soup = BeautifulSoup(response.text, 'lxml')
+                        tree = LexborHTMLParser(html)
                         
                         # Find blog posts
-                        posts = self._extract_blog_posts(soup)
+                        posts = self._extract_blog_posts(tree)
                         all_posts.extend(posts)
                         
                         # Analyze content types
@@ -157,7 +223,7 @@ class ContentStrategyAnalyzer:
                                     content_analysis["content_types"].get(content_type, 0) + 1
                         
                         break
-                except:
+                except Exception:
                     continue
             
             content_analysis["blog_posts"] = len(all_posts)
@@ -168,34 +234,36 @@ class ContentStrategyAnalyzer:
                 content_analysis["topics_covered"] = topics[:20]  # Top 20 topics
             
             # Check homepage for content depth
-            homepage_response = await self.client.get(f"https://{domain}")
-            homepage_soup = BeautifulSoup(homepage_response.text, 'lxml')
+            if homepage is None:
+                return content_analysis
+            homepage_tree, homepage_html = homepage
             
-            # Calculate content depth
-            text_content = homepage_soup.get_text()
+            # Calculate content depth (visible text, so drop script and style bodies)
+            homepage_tree.strip_tags(['script', 'style'])
+            text_content = homepage_tree.root.text() if homepage_tree.root else ""
             word_count = len(text_content.split())
             content_analysis["content_depth"] = word_count
             
             # Check for different content formats
-            if homepage_soup.find(['video', 'iframe']):
+            if homepage_tree.css_first('video, iframe'):
                 content_analysis["content_formats"].append("video")
-            if homepage_soup.find('img', alt=re.compile(r'infographic|chart|graph', re.I)):
+            if any(_INFOGRAPHIC_ALT_RE.search(img.attributes['alt'] or '') for img in homepage_tree.css('img[alt]')):
                 content_analysis["content_formats"].append("infographic")
-            if 'podcast' in homepage_response.text.lower():
+            if 'podcast' in homepage_html:
                 content_analysis["content_formats"].append("podcast")
-            if 'webinar' in homepage_response.text.lower():
+            if 'webinar' in homepage_html:
                 content_analysis["content_formats"].append("webinar")
-            if 'ebook' in homepage_response.text.lower() or 'whitepaper' in homepage_response.text.lower():
+            if 'ebook' in homepage_html or 'whitepaper' in homepage_html:
                 content_analysis["content_formats"].append("ebook")
             
             # Check for resources section
-            if 'resources' in homepage_response.text.lower() or 'library' in homepage_response.text.lower():
+            if 'resources' in homepage_html or 'library' in homepage_html:
                 content_analysis["has_resources"] = True
             
             # SEO optimization check
-            meta_description = homepage_soup.find('meta', attrs={'name': 'description'})
-            title_tag = homepage_soup.find('title')
-            h1_tags = homepage_soup.find_all('h1')
+            meta_description = homepage_tree.css_first('meta[name="description"]')
+            title_tag = homepage_tree.css_first('title')
+            h1_tags = homepage_tree.css('h1')
             
             if meta_description and title_tag and h1_tags:
                 content_analysis["seo_optimized"] = True
@@ -205,7 +273,7 @@ class ContentStrategyAnalyzer:
         
         return content_analysis
     
-    def _extract_blog_posts(self, soup: BeautifulSoup) -> List[Dict[str, str]]:
+    def _extract_blog_posts(self, tree: LexborHTMLParser) -> List[Dict[str, str]]:
         """Extract blog post information from a blog page"""
         posts = []
         
@@ -220,25 +288,25 @@ class ContentStrategyAnalyzer:
         ]
         
         for selector in article_selectors:
-            articles = soup.select(selector)
+            articles = tree.css(selector)
             if articles:
                 for article in articles[:20]:  # Limit to 20 posts
                     post = {}
                     
                     # Find title
-                    title = article.find(['h2', 'h3', 'h4', 'a'])
-                    if title:
-                        post["title"] = title.get_text(strip=True)
+                    title = _first_descendant(article, 'h2, h3, h4, a')
+                    if title is not None:
+                        post["title"] = title.text(strip=True)
                     
                     # Find link
-                    link = article.find('a', href=True)
-                    if link:
-                        post["url"] = link['href']
+                    link = _first_descendant(article, 'a[href]')
+                    if link is not None:
+                        post["url"] = link.attributes['href']
                     
                     # Find date
-                    date = article.find(['time', '.date', '.published'])
-                    if date:
-                        post["date"] = date.get_text(strip=True)
+                    date = _first_descendant(article, 'time')
+                    if date is not None:
+                        post["date"] = date.text(strip=True)
                     
                     if post.get("title"):
                         posts.append(post)
@@ -251,43 +319,39 @@ class ContentStrategyAnalyzer:
         """Identify the content type from title"""
         title_lower = title.lower()
         
-        for content_type, keywords in self.CONTENT_TYPES.items():
-            if any(keyword in title_lower for keyword in keywords):
+        for content_type, pattern in self.CONTENT_TYPE_PATTERNS:
+            if pattern.search(title_lower):
                 return content_type
         
         return None
     
     def _extract_topics(self, posts: List[Dict]) -> List[str]:
         """Extract main topics from blog posts"""
-        # Extract significant words from titles
-        all_words = []
-        stop_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
-                     'of', 'with', 'by', 'from', 'is', 'are', 'was', 'were', 'been'}
-        
+        # Extract and count significant words from titles
+        word_counts = Counter()
         for post in posts:
-            title = post.get("title", "").lower()
-            words = re.findall(r'\b[a-z]{4,}\b', title)
-            words = [w for w in words if w not in stop_words]
-            all_words.extend(words)
-        
-        # Count frequency
-        word_counts = Counter(all_words)
+            word_counts.update(_TOPIC_WORD_RE.findall(post.get("title", "").lower()))
         
         # Return most common topics
         return [word for word, count in word_counts.most_common(20)]
     
     async def _analyze_competitor_content(self, competitor_domains: List[str]) -> Dict[str, Any]:
         """Analyze competitor content strategies"""
-        competitor_content = {}
-        
-        for domain in competitor_domains:
-            try:
-                content = await self._analyze_current_content(domain)
-                competitor_content[domain] = content
-            except:
-                continue
-        
-        return competitor_content
+        # Competitor sites are independent, so audit them concurrently
+        audits = await asyncio.gather(
+            *(self._analyze_competitor_site(domain) for domain in competitor_domains),
+            return_exceptions=True
+        )
+        
+        return {
+            domain: content
+            for domain, content in zip(competitor_domains, audits)
+            if not isinstance(content, Exception)
+        }
+    
+    async def _analyze_competitor_site(self, domain: str) -> Dict[str, Any]:
+        """Audit one competitor's blog and homepage"""
+        return await self._analyze_current_content(domain, await self._fetch_homepage(domain))
     
     def _identify_content_gaps(self, current: Dict, competitors: Dict) -> List[Dict[str, Any]]:
         """Identify content gaps compared to competitors"""
@@ -352,21 +416,27 @@ class ContentStrategyAnalyzer:
         
         return gaps
     
-    async def _generate_content_pillars(self, domain: str, current_content: Dict) -> List[Dict[str, Any]]:
+    async def _generate_content_pillars(
+        self,
+        domain: str,
+        current_content: Dict,
+        homepage: Optional[Tuple[LexborHTMLParser, str]]
+    ) -> List[Dict[str, Any]]:
         """Generate content pillar recommendations using AI"""
         pillars = []
         
-        if self.openai_client:
+        if self.openai_client and homepage is not None:
             try:
-                # Get homepage content for context
-                response = await self.client.get(f"https://{domain}")
-                soup = BeautifulSoup(response.text, 'lxml')
+                # Homepage content for context
+                tree = homepage[0]
                 
                 # Extract key information
-                title = soup.find('title').get_text() if soup.find('title') else ""
-                meta_desc = soup.find('meta', attrs={'name': 'description'})
-                description = meta_desc.get('content') if meta_desc else ""
-                h1 = soup.find('h1').get_text() if soup.find('h1') else ""
+                title_node = tree.css_first('title')
+                title = title_node.text() if title_node else ""
+                meta_desc = tree.css_first('meta[name="description"]')
+                description = meta_desc.attributes.get('content') if meta_desc else ""
+                h1_node = tree.css_first('h1')
+                h1 = h1_node.text() if h1_node else ""
                 
                 prompt = f"""Based on this company:
                 Domain: {domain}
@@ -385,6 +455,14 @@ class ContentStrategyAnalyzer:
                 Pillar Name | Description | Example Topics (3) | Target Audience | Business Goal
                 """
                 
+                # The prompt captures everything the pillars depend on, so an
+                # unchanged homepage and topic list reuses the earlier answer
+                prompt_hash = hashlib.blake2b(prompt.encode(), digest_size=16).hexdigest()
+                pillars_key = f"content_pillars:{domain}:{prompt_hash}"
+                cached_pillars = await get_cached_result(pillars_key)
+                if cached_pillars:
+                    return cached_pillars
+                
                 response = await self.openai_client.chat.completions.create(
                     model=settings.OPENAI_MODEL,
                     messages=[{"role": "user", "content": prompt}],
@@ -406,6 +484,9 @@ class ContentStrategyAnalyzer:
                                 "business_goal": parts[4].strip()
                             })
                 
+                if pillars:
+                    await cache_result(pillars_key, pillars, ttl=CONTENT_PILLARS_TTL)
+                
             except Exception as e:
                 logger.error(f"Failed to generate content pillars using AI", error=str(e))
         
@@ -587,12 +668,12 @@ class ContentStrategyAnalyzer:
             score += 10
         
         # Buyer journey coverage (15 points)
-        journey = results.get("buyer_journey_coverage", {})
-        if not journey.get("gaps"):
+        gaps = results.get("buyer_journey_coverage", {}).get("gaps")
+        if not gaps:
             score += 15
-        elif len(journey.get("gaps", [])) == 1:
+        elif len(gaps) == 1:
             score += 10
-        elif len(journey.get("gaps", [])) == 2:
+        elif len(gaps) == 2:
             score += 5
         
         return min(score, 100)
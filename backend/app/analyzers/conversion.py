@@ -9,17 +9,17 @@ from app.utils.cache import cache_result, get_cached_result
 
 logger = structlog.get_logger()
 
+# Conversion path phrases matched against lowercased page and link text
+CONVERSION_PATTERNS = {
+    "demo": ("demo", "get demo", "request demo", "book demo", "schedule demo"),
+    "trial": ("free trial", "start trial", "try free", "try it free", "14-day trial"),
+    "signup": ("sign up", "get started", "create account", "start now", "join"),
+    "contact": ("contact us", "get in touch", "talk to sales", "contact sales"),
+    "pricing": ("pricing", "plans", "see pricing", "view pricing", "price")
+}
+
 
 class ConversionAnalyzer:
-    def __init__(self):
-        self.conversion_patterns = {
-            "demo": ["demo", "get demo", "request demo", "book demo", "schedule demo"],
-            "trial": ["free trial", "start trial", "try free", "try it free", "14-day trial"],
-            "signup": ["sign up", "get started", "create account", "start now", "join"],
-            "contact": ["contact us", "get in touch", "talk to sales", "contact sales"],
-            "pricing": ["pricing", "plans", "see pricing", "view pricing", "price"]
-        }
-    
     async def analyze(self, domain: str, industry: Industry) -> Dict[str, Any]:
         cache_key = f"conversion:{domain}"
         cached = await get_cached_result(cache_key)
@@ -44,13 +44,15 @@ class ConversionAnalyzer:
             async with httpx.AsyncClient() as client:
                 response = await client.get(f"https://{domain}", timeout=10.0, follow_redirects=True)
                 soup = BeautifulSoup(response.text, 'lxml')
+                # Page text is needed by both CTA and trust checks; extract it once
+                page_text = soup.get_text().lower()
                 
                 # Analyze forms
                 forms_data = self._analyze_forms(soup)
                 results.update(forms_data)
                 
                 # Analyze CTAs
-                cta_data = self._analyze_ctas(soup)
+                cta_data = self._analyze_ctas(soup, page_text)
                 results.update(cta_data)
                 
                 # Analyze conversion paths
@@ -58,7 +60,7 @@ class ConversionAnalyzer:
                 results.update(paths_data)
                 
                 # Analyze trust signals
-                trust_data = self._analyze_trust_signals(soup)
+                trust_data = self._analyze_trust_signals(soup, page_text)
                 results.update(trust_data)
                 
                 # Calculate overall score
@@ -107,7 +109,7 @@ class ConversionAnalyzer:
         
         return results
     
-    def _analyze_ctas(self, soup: BeautifulSoup) -> Dict:
+    def _analyze_ctas(self, soup: BeautifulSoup, page_text: str) -> Dict:
         results = {
             "cta_clarity": "weak",
             "cta_text": "",
@@ -141,10 +143,9 @@ class ConversionAnalyzer:
                 results["cta_clarity"] = "medium"
         
         # Check for free trial
-        page_text = soup.get_text().lower()
-        results["has_free_trial"] = any(pattern in page_text for pattern in self.conversion_patterns["trial"])
-        results["has_demo"] = any(pattern in page_text for pattern in self.conversion_patterns["demo"])
-        results["has_pricing"] = any(pattern in page_text for pattern in self.conversion_patterns["pricing"])
+        results["has_free_trial"] = any(pattern in page_text for pattern in CONVERSION_PATTERNS["trial"])
+        results["has_demo"] = any(pattern in page_text for pattern in CONVERSION_PATTERNS["demo"])
+        results["has_pricing"] = any(pattern in page_text for pattern in CONVERSION_PATTERNS["pricing"])
         
         return results
     
@@ -163,7 +164,7 @@ class ConversionAnalyzer:
             nav_links = nav.find_all('a')
             for link in nav_links:
                 text = link.get_text(strip=True).lower()
-                for path_type, patterns in self.conversion_patterns.items():
+                for path_type, patterns in CONVERSION_PATTERNS.items():
                     if any(p in text for p in patterns):
                         paths.append({
                             "type": path_type,
@@ -195,7 +196,7 @@ class ConversionAnalyzer:
         
         return results
     
-    def _analyze_trust_signals(self, soup: BeautifulSoup) -> Dict:
+    def _analyze_trust_signals(self, soup: BeautifulSoup, page_text: str) -> Dict:
         results = {
             "trust_signals": [],
             "trust_score": 0
@@ -216,7 +217,6 @@ class ConversionAnalyzer:
         
         # Check for security badges
         security_terms = ['soc2', 'iso', 'gdpr', 'hipaa', 'secure', 'encrypted']
-        page_text = soup.get_text().lower()
         for term in security_terms:
             if term in page_text:
                 signals.append(f"{term}_compliant")
@@ -3,11 +3,12 @@ Advanced form analyzer that detects specific conversion killers
 Goes beyond basic field counting to identify actual friction points
 """
 
+import heapq
 import httpx
 from typing import Dict, Any, List, Optional
 import re
 import structlog
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from urllib.parse import urljoin
 
 from app.utils.cache import cache_result, get_cached_result
@@ -115,7 +116,7 @@ class FormConversionKillerAnalyzer:
             # Get homepage
             response = await client.get(f"https://{domain}", follow_redirects=True)
             if response.status_code == 200:
-                soup = BeautifulSoup(response.text, 'html.parser')
+                soup = BeautifulSoup(response.text, 'html.parser', parse_only=SoupStrainer(['a', 'form']))
                 
                 # Find links to form pages
                 for link in soup.find_all('a', href=True):
@@ -688,7 +689,7 @@ class FormConversionKillerAnalyzer:
                     })
         
         # Sort by impact
-        return sorted(critical, key=lambda x: x.get("severity", "") == "critical", reverse=True)[:5]
+        return heapq.nlargest(5, critical, key=lambda x: x.get("severity", "") == "critical")
     
     def _generate_quick_fixes(self, form_issues: List[Dict]) -> List[Dict]:
         """Generate list of quick fixes (< 1 hour to implement)"""
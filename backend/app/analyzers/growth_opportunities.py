@@ -1,5 +1,6 @@
 import httpx
 import asyncio
+import heapq
 from typing import Dict, Any, List, Optional
 import re
 from bs4 import BeautifulSoup
@@ -1048,10 +1049,8 @@ class GrowthOpportunitiesAnalyzer:
                             'item': item
                         })
         
-        # Sort by priority
-        all_opportunities.sort(key=lambda x: x['item'].get('priority_score', 0), reverse=True)
-        
-        # Add top 5 to quick wins
-        results['quick_wins'] = [opp['item'] for opp in all_opportunities[:5]]
+        # Add top 5 by priority to quick wins (partial selection, no full sort)
+        top_opportunities = heapq.nlargest(5, all_opportunities, key=lambda x: x['item'].get('priority_score', 0))
+        results['quick_wins'] = [opp['item'] for opp in top_opportunities]
         
         return results
\ No newline at end of file
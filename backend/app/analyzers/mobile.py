@@ -1,14 +1,28 @@
 import httpx
+import re
 from typing import Dict, Any
 import structlog
-from bs4 import BeautifulSoup
+from selectolax.lexbor import LexborHTMLParser
 
 from app.utils.cache import cache_result, get_cached_result
+from app.utils.http_client import get_http_client
 
 logger = structlog.get_logger()
 
+# Inline CSS patterns for mobile layout/readability issues, matched in one pass
+_CSS_ISSUE_RE = re.compile(
+    r"(?P<horizontal_scroll>overflow-x:\s*(?:scroll|auto))"
+    r"|(?P<fixed_width>width:\s*(?:1024|1200)px)"
+    r"|(?P<small_text>font-size:\s*1[01]px)"
+)
+
 
 class MobileAnalyzer:
+    # Built once: httpx would otherwise normalise a fresh headers dict on every request
+    MOBILE_HEADERS = httpx.Headers({
+        "User-Agent": "Mozilla/5.0 (iPhone; CPU iPhone OS 14_0 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.0 Mobile/15E148 Safari/604.1"
+    })
+    
     def __init__(self):
         pass
     
@@ -29,115 +43,108 @@ class MobileAnalyzer:
         }
         
         try:
-            async with httpx.AsyncClient() as client:
-                # Set mobile user agent
-                headers = {
-                    "User-Agent": "Mozilla/5.0 (iPhone; CPU iPhone OS 14_0 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.0 Mobile/15E148 Safari/604.1"
-                }
-                
-                response = await client.get(f"https://{domain}", headers=headers, timeout=10.0)
-                soup = BeautifulSoup(response.text, 'lxml')
-                
-                # Check viewport meta tag
-                viewport = soup.find('meta', attrs={'name': 'viewport'})
-                if viewport:
-                    results["has_viewport"] = True
-                    viewport_content = viewport.get('content', '')
-                    if 'width=device-width' in viewport_content:
-                        results["responsive_design"] = True
-                else:
-                    results["missing_viewport"] = True
-                    results["issues"].append({
-                        "type": "viewport",
-                        "severity": "critical",
-                        "message": "Missing viewport meta tag - site won't scale on mobile"
-                    })
-                
-                # Check for common mobile issues
-                
-                # Check for horizontal scroll (basic check)
-                styles = soup.find_all('style')
-                css_text = ' '.join([s.text for s in styles])
-                if 'overflow-x: scroll' in css_text or 'overflow-x: auto' in css_text:
-                    results["issues"].append({
-                        "type": "layout",
-                        "severity": "high",
-                        "message": "Potential horizontal scrolling on mobile"
-                    })
-                
-                # Check for fixed widths
-                if 'width: 1024px' in css_text or 'width: 1200px' in css_text:
-                    results["issues"].append({
-                        "type": "layout",
-                        "severity": "high",
-                        "message": "Fixed width layouts may break on mobile"
-                    })
-                
-                # Check for mobile-unfriendly elements
-                flash_elements = soup.find_all(['object', 'embed'])
-                if flash_elements:
-                    results["issues"].append({
-                        "type": "compatibility",
-                        "severity": "critical",
-                        "message": "Contains Flash/plugins not supported on mobile"
-                    })
-                
-                # Check button/link sizes (basic heuristic)
-                buttons = soup.find_all(['button', 'a'])
-                small_targets = 0
-                for button in buttons[:20]:  # Check first 20
-                    # This is a heuristic - in production would use actual rendering
-                    classes = button.get('class', [])
-                    if isinstance(classes, list):
-                        class_str = ' '.join(classes)
-                    else:
-                        class_str = classes
-                    
-                    if 'sm' in class_str or 'small' in class_str or 'tiny' in class_str:
-                        small_targets += 1
-                
-                if small_targets > 5:
-                    results["issues"].append({
-                        "type": "usability",
-                        "severity": "medium",
-                        "message": "Multiple small tap targets detected"
-                    })
-                    results["tap_targets"] = "too_small"
-                else:
-                    results["tap_targets"] = "adequate"
-                
-                # Check text readability
-                if 'font-size: 10px' in css_text or 'font-size: 11px' in css_text:
-                    results["issues"].append({
-                        "type": "readability",
-                        "severity": "medium",
-                        "message": "Text may be too small to read on mobile"
-                    })
-                    results["text_size"] = "too_small"
-                else:
-                    results["text_size"] = "adequate"
-                
-                # Calculate mobile score
-                score = 70  # Base score
-                
-                if results["has_viewport"]:
-                    score += 20
-                if results["responsive_design"]:
-                    score += 10
-                
-                # Deduct for issues
-                for issue in results["issues"]:
-                    if issue["severity"] == "critical":
-                        score -= 20
-                    elif issue["severity"] == "high":
-                        score -= 10
-                    elif issue["severity"] == "medium":
-                        score -= 5
-                
-                results["score"] = max(0, min(100, score))
-                
-                await cache_result(cache_key, results, ttl=3600)
+            client = get_http_client()
+            # Request with a mobile user agent
+            response = await client.get(f"https://{domain}", headers=self.MOBILE_HEADERS, timeout=10.0, follow_redirects=False)
+            tree = LexborHTMLParser(response.text)
+            
+            # Check viewport meta tag
+            viewport = tree.css_first('meta[name="viewport"]')
+            if viewport:
+                results["has_viewport"] = True
+                viewport_content = viewport.attributes.get('content') or ''
+                if 'width=device-width' in viewport_content:
+                    results["responsive_design"] = True
+            else:
+                results["missing_viewport"] = True
+                results["issues"].append({
+                    "type": "viewport",
+                    "severity": "critical",
+                    "message": "Missing viewport meta tag - site won't scale on mobile"
+                })
+            
+            # Check for common mobile issues
+            
+            # Check for horizontal scroll (basic check)
+            styles = tree.css('style')
+            css_text = ' '.join([s.text() for s in styles])
+            css_issues = {match.lastgroup for match in _CSS_ISSUE_RE.finditer(css_text)}
+            if "horizontal_scroll" in css_issues:
+                results["issues"].append({
+                    "type": "layout",
+                    "severity": "high",
+                    "message": "Potential horizontal scrolling on mobile"
+                })
+            
+            # Check for fixed widths
+            if "fixed_width" in css_issues:
+                results["issues"].append({
+                    "type": "layout",
+                    "severity": "high",
+                    "message": "Fixed width layouts may break on mobile"
+                })
+            
+            # Check for mobile-unfriendly elements
+            flash_elements = tree.css('object, embed')
+            if flash_elements:
+                results["issues"].append({
+                    "type": "compatibility",
+                    "severity": "critical",
+                    "message": "Contains Flash/plugins not supported on mobile"
+                })
+            
+            # Check button/link sizes (basic heuristic)
+            buttons = tree.css('button, a')
+            small_targets = 0
+            for button in buttons[:20]:  # Check first 20
+                # This is a heuristic - in production would use actual rendering
+                class_str = button.attributes.get('class') or ''
                 
+                if 'sm' in class_str or 'small' in class_str or 'tiny' in class_str:
+                    small_targets += 1
+            
+            if small_targets > 5:
+                results["issues"].append({
+                    "type": "usability",
+                    "severity": "medium",
+                    "message": "Multiple small tap targets detected"
+                })
+                results["tap_targets"] = "too_small"
+            else:
+                results["tap_targets"] = "adequate"
+            
+            # Check text readability
+            if "small_text" in css_issues:
+                results["issues"].append({
+                    "type": "readability",
+                    "severity": "medium",
+                    "message": "Text may be too small to read on mobile"
+                })
+                results["text_size"] = "too_small"
+            else:
+                results["text_size"] = "adequate"
+            
+            # Calculate mobile score
+            score = 70  # Base score
+            
+            if results["has_viewport"]:
+                score += 20
+            if results["responsive_design"]:
+                score += 10
+            
+            # Deduct for issues
+            for issue in results["issues"]:
+                if issue["severity"] == "critical":
+                    score -= 20
+                elif issue["severity"] == "high":
+                    score -= 10
+                elif issue["severity"] == "medium":
+                    score -= 5
+            
+            results["score"] = max(0, min(100, score))
+            
+            await cache_result(cache_key, results, ttl=3600)
+            
         except Exception as e:
             logger.error("Mobile analysis failed", domain=domain, error=str(e))
             results["score"] = 0
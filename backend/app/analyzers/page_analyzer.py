@@ -1,6 +1,7 @@
 import httpx
+import heapq
 import re
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, List, Optional, Set, Tuple
 from bs4 import BeautifulSoup
 import structlog
 from urllib.parse import urljoin, urlparse
@@ -11,6 +12,12 @@ from app.utils.cache import cache_result, get_cached_result
 
 logger = structlog.get_logger()
 
+# Sort rank for recommendation priorities; unknown priorities sort last
+PRIORITY_ORDER = {"critical": 0, "high": 1, "medium": 2, "low": 3}
+
+# Word tokens used to build the per-page term set
+_WORD_RE = re.compile(r"[a-z][a-z']+")
+
 
 class PageAnalyzer:
     """
@@ -28,6 +35,22 @@ class PageAnalyzer:
         "blog": ["blog", "resources", "learn", "articles", "news"]
     }
     
+    # Keyword lists folded into one alternation per page type, built once per process
+    CRITICAL_PAGE_PATTERNS = tuple(
+        (page_type, re.compile('|'.join(re.escape(keyword) for keyword in keywords)))
+        for page_type, keywords in CRITICAL_PAGES.items()
+    )
+    
+    # Points awarded for each trust signal found on a page
+    TRUST_SIGNAL_WEIGHTS = {
+        "has_testimonials": 20,
+        "has_logos": 20,
+        "has_security_badges": 15,
+        "has_certifications": 15,
+        "has_reviews": 20,
+        "has_case_studies": 10
+    }
+    
     def __init__(self):
         self.client = None
         
@@ -103,30 +126,25 @@ class PageAnalyzer:
             response = await self.client.get(f"https://{domain}")
             soup = BeautifulSoup(response.text, 'lxml')
             
-            # Find all links
-            links = soup.find_all('a', href=True)
+            # Find all links, extracting href and anchor text once for every page type
+            links = [
+                (link.get('href', '').lower(), link.get_text(strip=True).lower())
+                for link in soup.find_all('a', href=True)
+            ]
             
-            for page_type, keywords in self.CRITICAL_PAGES.items():
+            for page_type, pattern in self.CRITICAL_PAGE_PATTERNS:
                 found_url = None
                 
-                # Check each link for keywords
-                for link in links:
-                    href = link.get('href', '').lower()
-                    text = link.get_text(strip=True).lower()
-                    
-                    # Check if any keyword matches
-                    for keyword in keywords:
-                        if keyword in href or keyword in text:
-                            # Construct full URL
-                            if href.startswith('http'):
-                                found_url = href
-                            elif href.startswith('/'):
-                                found_url = f"https://{domain}{href}"
-                            else:
-                                found_url = urljoin(f"https://{domain}", href)
-                            break
-                    
-                    if found_url:
+                # Check each link for any of the page type's keywords
+                for href, text in links:
+                    if pattern.search(href) or pattern.search(text):
+                        # Construct full URL
+                        if href.startswith('http'):
+                            found_url = href
+                        elif href.startswith('/'):
+                            found_url = f"https://{domain}{href}"
+                        else:
+                            found_url = urljoin(f"https://{domain}", href)
                         break
                 
                 pages[page_type] = found_url
@@ -190,12 +208,14 @@ class PageAnalyzer:
             response = await self.client.get(url)
             soup = BeautifulSoup(response.text, 'lxml')
             content = response.text.lower()
+            # Phrases are matched on visible text; markup and entities would split them
+            terms = self._extract_terms(soup.get_text(" ").replace('\xa0', ' ').lower())
             
             # Page-specific analysis based on type
             if page_type == "pricing":
-                analysis.update(self._analyze_pricing_page(soup, content))
+                analysis.update(self._analyze_pricing_page(soup, content, terms))
             elif page_type == "demo":
-                analysis.update(self._analyze_demo_page(soup, content))
+                analysis.update(self._analyze_demo_page(soup, content, terms))
             elif page_type == "features":
                 analysis.update(self._analyze_features_page(soup, content))
             elif page_type == "about":
@@ -204,7 +224,7 @@ class PageAnalyzer:
             # Common analysis for all pages
             analysis["forms"] = self._analyze_forms(soup)
             analysis["ctas"] = self._analyze_ctas(soup)
-            analysis["trust_signals"] = self._analyze_trust_signals(soup, content)
+            analysis["trust_signals"] = self._analyze_trust_signals(soup, content, terms)
             analysis["load_size"] = len(response.text)
             analysis["images"] = len(soup.find_all('img'))
             analysis["videos"] = len(soup.find_all(['video', 'iframe']))
@@ -221,7 +241,14 @@ class PageAnalyzer:
         
         return analysis
     
-    def _analyze_pricing_page(self, soup: BeautifulSoup, content: str) -> Dict[str, Any]:
+    def _extract_terms(self, text: str) -> Set[str]:
+        """Tokenize lowercased visible page text into a set of words and two-word phrases"""
+        words = _WORD_RE.findall(text)
+        terms = set(words)
+        terms.update(f"{first} {second}" for first, second in zip(words, words[1:]))
+        return terms
+    
+    def _analyze_pricing_page(self, soup: BeautifulSoup, content: str, terms: Set[str]) -> Dict[str, Any]:
         """Specific analysis for pricing pages"""
         analysis = {
             "pricing_analysis": {},
@@ -233,7 +260,7 @@ class PageAnalyzer:
         
         # Check for pricing tiers
         tier_indicators = ['starter', 'pro', 'enterprise', 'basic', 'premium', 'free']
-        tiers_found = sum(1 for tier in tier_indicators if tier in content)
+        tiers_found = sum(1 for tier in tier_indicators if tier in terms)
         pricing["tier_count"] = tiers_found
         
         # Check for pricing display
@@ -242,7 +269,7 @@ class PageAnalyzer:
         pricing["shows_prices"] = has_prices
         
         # Check for free trial
-        pricing["has_free_trial"] = 'free trial' in content or 'try free' in content
+        pricing["has_free_trial"] = 'free trial' in terms or 'try free' in terms
         
         # Check for money-back guarantee
         pricing["has_guarantee"] = 'guarantee' in content or 'refund' in content
@@ -289,7 +316,7 @@ class PageAnalyzer:
         
         return analysis
     
-    def _analyze_demo_page(self, soup: BeautifulSoup, content: str) -> Dict[str, Any]:
+    def _analyze_demo_page(self, soup: BeautifulSoup, content: str, terms: Set[str]) -> Dict[str, Any]:
         """Specific analysis for demo/signup pages"""
         analysis = {
             "demo_analysis": {},
@@ -338,7 +365,7 @@ class PageAnalyzer:
             demo["field_types"] = field_types
             
             # Check for social login
-            demo["has_social_login"] = 'google' in content or 'linkedin' in content or 'github' in content
+            demo["has_social_login"] = 'google' in terms or 'linkedin' in terms or 'github' in terms
             
             # Issues and opportunities
             if demo["field_count"] > 5:
@@ -525,58 +552,42 @@ class PageAnalyzer:
         strong_cta_words = ['start', 'try', 'get', 'demo', 'free', 'now', 'today']
         weak_cta_words = ['submit', 'click', 'learn more', 'continue']
         
-        if any(word in ' '.join(cta_texts).lower() for word in strong_cta_words):
+        cta_text_lower = ' '.join(cta_texts).lower()
+        if any(word in cta_text_lower for word in strong_cta_words):
             cta_analysis["cta_clarity"] = "strong"
-        elif any(word in ' '.join(cta_texts).lower() for word in weak_cta_words):
+        elif any(word in cta_text_lower for word in weak_cta_words):
             cta_analysis["cta_clarity"] = "weak"
         else:
             cta_analysis["cta_clarity"] = "moderate"
         
         return cta_analysis
     
-    def _analyze_trust_signals(self, soup: BeautifulSoup, content: str) -> Dict[str, Any]:
+    def _analyze_trust_signals(self, soup: BeautifulSoup, content: str, terms: Set[str]) -> Dict[str, Any]:
         """Analyze trust signals on the page"""
-        trust = {
-            "has_testimonials": False,
-            "has_logos": False,
-            "has_security_badges": False,
-            "has_certifications": False,
-            "has_reviews": False,
-            "has_case_studies": False,
-            "trust_score": 0
-        }
-        
-        # Check for testimonials
-        if 'testimonial' in content or 'what our customers say' in content:
-            trust["has_testimonials"] = True
-            trust["trust_score"] += 20
-        
-        # Check for customer logos
-        if 'customer' in content and ('logo' in content or soup.find_all('img', alt=re.compile(r'customer|client|logo', re.I))):
-            trust["has_logos"] = True
-            trust["trust_score"] += 20
-        
-        # Check for security badges
         security_terms = ['ssl', 'secure', 'encrypted', 'soc2', 'iso', 'gdpr', 'compliant']
-        if any(term in content for term in security_terms):
-            trust["has_security_badges"] = True
-            trust["trust_score"] += 15
-        
-        # Check for certifications
         cert_terms = ['certified', 'accredited', 'award', 'recognized']
-        if any(term in content for term in cert_terms):
-            trust["has_certifications"] = True
-            trust["trust_score"] += 15
         
-        # Check for reviews
-        if 'review' in content or 'rating' in content or '★' in content:
-            trust["has_reviews"] = True
-            trust["trust_score"] += 20
+        trust = {
+            # Testimonials
+            "has_testimonials": 'testimonial' in content or 'what our customers say' in content,
+            # Customer logos
+            "has_logos": 'customer' in content and (
+                'logo' in content or bool(soup.find_all('img', alt=re.compile(r'customer|client|logo', re.I)))
+            ),
+            # Security badges
+            "has_security_badges": any(term in content for term in security_terms),
+            # Certifications
+            "has_certifications": any(term in content for term in cert_terms),
+            # Reviews
+            "has_reviews": 'review' in content or 'rating' in content or '★' in content,
+            # Case studies
+            "has_case_studies": 'case study' in terms or 'case studies' in terms or 'success story' in terms,
+        }
         
-        # Check for case studies
-        if 'case study' in content or 'case studies' in content or 'success story' in content:
-            trust["has_case_studies"] = True
-            trust["trust_score"] += 10
+        # Score is a weighted sum over the detected flags
+        trust["trust_score"] = sum(
+            weight * trust[flag] for flag, weight in self.TRUST_SIGNAL_WEIGHTS.items()
+        )
         
         return trust
     
@@ -709,7 +720,4 @@ class PageAnalyzer:
                 })
         
         # Sort by priority
-        priority_order = {"critical": 0, "high": 1, "medium": 2, "low": 3}
-        recommendations.sort(key=lambda x: priority_order.get(x["priority"], 4))
-        
-        return recommendations[:10]  # Top 10 recommendations
\ No newline at end of file
+        return heapq.nsmallest(10, recommendations, key=lambda x: PRIORITY_ORDER.get(x["priority"], 4))  # Top 10 recommendations
\ No newline at end of file
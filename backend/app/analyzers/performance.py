@@ -1,16 +1,73 @@
 import httpx
 import asyncio
+import heapq
+import orjson
+import re
+import time
+from operator import itemgetter
+from types import MappingProxyType
 from typing import Dict, Any, Optional
 import structlog
-from bs4 import BeautifulSoup
+from selectolax.lexbor import LexborHTMLParser
 
 from app.config import settings
 from app.utils.cache import cache_result, get_cached_result
+from app.utils.http_client import get_http_client
 
 logger = structlog.get_logger()
 
+# Image src heuristics for the HTML fallback: raster formats that are likely
+# full-size unless the filename marks them as a thumbnail/icon
+_RASTER_IMAGE_RE = re.compile(r'\.(?:jpe?g|png|gif|bmp)')
+_SMALL_IMAGE_RE = re.compile(r'thumb|small|icon|logo')
+
+# Shared read-only default for missing Lighthouse sections, instead of a new {} per lookup
+_EMPTY = MappingProxyType({})
+
+# Cache TTLs by data source: Lighthouse scores change slowly and cost a PageSpeed
+# API call, the HTML fallback is cheap and should be replaced soon by real data
+SECTION_TTL = {
+    "pagespeed": 21600,  # 6 hours
+    "basic": 3600  # 1 hour
+}
+
+# In-flight PageSpeed requests by domain, so analyzers running concurrently for
+# the same domain share one API call
+_pagespeed_requests: Dict[str, asyncio.Task] = {}
+
+# Circuit breaker for the PageSpeed API: after BREAKER_THRESHOLD quota/server
+# failures within BREAKER_WINDOW seconds, stop calling it for BREAKER_COOLDOWN
+# seconds, then let a single probe through before closing again
+BREAKER_THRESHOLD = 3
+BREAKER_WINDOW = 60
+BREAKER_COOLDOWN = 300
+_pagespeed_breaker = {"failures": 0, "window_start": 0.0, "open_until": 0.0, "probing": False}
+
+# How long a failed PageSpeed run for one domain is remembered across workers
+PAGESPEED_NEGATIVE_TTL = 120
+
 
 class PerformanceAnalyzer:
+    # Lighthouse audit id -> (result key, divisor applied to numericValue; None keeps it as-is)
+    METRIC_AUDITS = {
+        "first-contentful-paint": ("first_contentful_paint", 1000),
+        "interactive": ("time_to_interactive", 1000),
+        "total-blocking-time": ("total_blocking_time", None),
+        "cumulative-layout-shift": ("cumulative_layout_shift", None),
+        "speed-index": ("load_time", 1000),  # Estimated load time
+        "unused-css-rules": ("unused_css", 1024),  # Convert to KB
+        "unused-javascript": ("unused_js", 1024)  # Convert to KB
+    }
+    
+    # Lighthouse audit id -> result key, for audits reported as a count of flagged items
+    ITEM_COUNT_AUDITS = {
+        "uses-optimized-images": "unoptimized_images",
+        "render-blocking-resources": "render_blocking_resources"
+    }
+    
+    # Every audit id either table reads; most audits are in neither
+    SPEC_AUDIT_IDS = frozenset(METRIC_AUDITS) | frozenset(ITEM_COUNT_AUDITS)
+    
     def __init__(self):
         self.pagespeed_api_key = settings.GOOGLE_PAGESPEED_API_KEY
         self.pagespeed_url = "https://www.googleapis.com/pagespeedonline/v5/runPagespeed"
@@ -37,15 +94,17 @@ class PerformanceAnalyzer:
             "api_failed": False
         }
         
+        ttl = SECTION_TTL["basic"]
         try:
             # Try PageSpeed Insights API first
             if self.pagespeed_api_key:
-                pagespeed_data = await self._get_pagespeed_data(domain)
+                pagespeed_data = await self.get_pagespeed_data(domain)
                 if pagespeed_data:
                     parsed = self._parse_pagespeed_data(pagespeed_data)
                     if parsed:
                         results.update(parsed)
                         results["api_failed"] = False
+                        ttl = SECTION_TTL["pagespeed"]
                     else:
                         logger.warning(f"PageSpeed API returned no data for {domain}, using fallback")
                         results["api_failed"] = True
@@ -63,7 +122,7 @@ class PerformanceAnalyzer:
                 results.update(fallback)
             
             # Cache results
-            await cache_result(cache_key, results, ttl=3600)
+            await cache_result(cache_key, results, ttl=ttl)
             
             return results
             
@@ -77,36 +136,103 @@ class PerformanceAnalyzer:
                 pass
             return results
     
+    async def get_pagespeed_data(self, domain: str) -> Dict:
+        """Raw PageSpeed Insights response for a domain ({} on failure), deduplicated across callers"""
+        task = _pagespeed_requests.get(domain)
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.ensure_future(self._get_pagespeed_data(domain))
+            _pagespeed_requests[domain] = task
+            
+            def _forget(finished: asyncio.Task) -> None:
+                if _pagespeed_requests.get(domain) is finished:
+                    del _pagespeed_requests[domain]
+            
+            task.add_done_callback(_forget)
+        
+        # Shielded so one caller being cancelled does not cancel the shared request
+        return await asyncio.shield(task)
+    
+    def _pagespeed_allowed(self) -> bool:
+        breaker = _pagespeed_breaker
+        if not breaker["open_until"]:
+            return True
+        now = time.monotonic()
+        if now < breaker["open_until"]:
+            return False
+        # Cooldown over: half-open. This call probes the API, others stay out
+        # until it reports back (or another cooldown passes)
+        breaker.update(open_until=now + BREAKER_COOLDOWN, probing=True)
+        return True
+    
+    def _record_pagespeed_result(self, success: bool) -> None:
+        breaker = _pagespeed_breaker
+        now = time.monotonic()
+        if success:
+            breaker.update(failures=0, open_until=0.0, probing=False)
+            return
+        
+        if now - breaker["window_start"] > BREAKER_WINDOW:
+            breaker["failures"] = 0
+            breaker["window_start"] = now
+        breaker["failures"] += 1
+        
+        if breaker["probing"] or breaker["failures"] >= BREAKER_THRESHOLD:
+            logger.warning("PageSpeed API circuit breaker open", cooldown=BREAKER_COOLDOWN)
+            breaker.update(failures=0, open_until=now + BREAKER_COOLDOWN, probing=False)
+    
     async def _get_pagespeed_data(self, domain: str) -> Dict:
-        async with httpx.AsyncClient() as client:
-            params = {
-                "url": f"https://{domain}",
-                "key": self.pagespeed_api_key,
-                "category": ["performance", "accessibility", "best-practices", "seo"],
-                "strategy": "desktop"
-            }
+        negative_key = f"pagespeed_failed:{domain}"
+        if await get_cached_result(negative_key):
+            logger.info(f"Skipping PageSpeed API for {domain}, recent failure cached")
+            return {}
+        
+        if not self._pagespeed_allowed():
+            logger.info(f"Skipping PageSpeed API for {domain}, circuit breaker open")
+            return {}
+        
+        client = get_http_client()
+        params = {
+            "url": f"https://{domain}",
+            "key": self.pagespeed_api_key,
+            "category": ["performance", "accessibility", "best-practices", "seo"],
+            "strategy": "desktop",
+            # Partial response: only the parts callers read. Skips the full-page
+            # screenshot, CrUX field data, i18n strings and stack packs, which
+            # make up most of a multi-megabyte Lighthouse payload
+            "fields": "lighthouseResult(categories,audits)"
+        }
+        
+        try:
+            logger.info(f"Calling PageSpeed API for {domain}")
+            response = await client.get(
+                self.pagespeed_url,
+                params=params,
+                timeout=30.0
+            )
             
-            try:
-                logger.info(f"Calling PageSpeed API for {domain}")
-                response = await client.get(
-                    self.pagespeed_url,
-                    params=params,
-                    timeout=30.0
-                )
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    logger.info(f"PageSpeed API success for {domain}")
-                    return data
+            if response.status_code == 200:
+                data = orjson.loads(response.content)
+                logger.info(f"PageSpeed API success for {domain}")
+                self._record_pagespeed_result(True)
+                return data
+            else:
+                error_text = response.text
+                logger.warning(f"PageSpeed API failed for {domain}", 
+                             status=response.status_code, 
+                             error=error_text[:200])
+                # Quota and server errors count towards the breaker; any
+                # failure is remembered briefly for this domain
+                if response.status_code == 429 or response.status_code >= 500:
+                    self._record_pagespeed_result(False)
                 else:
-                    error_text = response.text
-                    logger.warning(f"PageSpeed API failed for {domain}", 
-                                 status=response.status_code, 
-                                 error=error_text[:200])
-                    return {}
-            except Exception as e:
-                logger.error(f"PageSpeed API exception for {domain}", error=str(e))
+                    self._record_pagespeed_result(True)
+                await cache_result(negative_key, True, ttl=PAGESPEED_NEGATIVE_TTL)
                 return {}
+        except Exception as e:
+            logger.error(f"PageSpeed API exception for {domain}", error=str(e))
+            self._record_pagespeed_result(False)
+            await cache_result(negative_key, True, ttl=PAGESPEED_NEGATIVE_TTL)
+            return {}
     
     def _parse_pagespeed_data(self, data: Dict) -> Dict:
         if not data:
@@ -115,72 +241,47 @@ class PerformanceAnalyzer:
         results = {}
         
         # Get lighthouse data
-        lighthouse = data.get("lighthouseResult", {})
+        lighthouse = data.get("lighthouseResult", _EMPTY)
         
         # Overall score
-        categories = lighthouse.get("categories", {})
-        perf_category = categories.get("performance", {})
-        score = perf_category.get("score")
+        score = lighthouse.get("categories", _EMPTY).get("performance", _EMPTY).get("score")
         results["score"] = int(score * 100) if score is not None else 0
         
         # Core Web Vitals
-        audits = lighthouse.get("audits", {})
+        audits = lighthouse.get("audits", _EMPTY)
         
-        # Load time metrics
-        if "first-contentful-paint" in audits:
-            fcp_value = audits["first-contentful-paint"].get("numericValue")
-            results["first_contentful_paint"] = (fcp_value / 1000) if fcp_value is not None else 0
-        
-        if "interactive" in audits:
-            tti_value = audits["interactive"].get("numericValue")
-            results["time_to_interactive"] = (tti_value / 1000) if tti_value is not None else 0
-        
-        if "total-blocking-time" in audits:
-            tbt_value = audits["total-blocking-time"].get("numericValue")
-            results["total_blocking_time"] = tbt_value if tbt_value is not None else 0
-        
-        if "cumulative-layout-shift" in audits:
-            cls_value = audits["cumulative-layout-shift"].get("numericValue")
-            results["cumulative_layout_shift"] = cls_value if cls_value is not None else 0
-        
-        # Calculate estimated load time
-        if "speed-index" in audits:
-            si_value = audits["speed-index"].get("numericValue")
-            results["load_time"] = (si_value / 1000) if si_value is not None else 0
-        
-        # Optimization opportunities
-        if "uses-optimized-images" in audits:
-            img_audit = audits["uses-optimized-images"]
-            if img_audit.get("details", {}).get("items"):
-                results["unoptimized_images"] = len(img_audit["details"]["items"])
-        
-        if "unused-css-rules" in audits:
-            css_audit = audits["unused-css-rules"]
-            css_value = css_audit.get("numericValue")
-            results["unused_css"] = (css_value / 1024) if css_value is not None else 0  # Convert to KB
-        
-        if "unused-javascript" in audits:
-            js_audit = audits["unused-javascript"]
-            js_value = js_audit.get("numericValue")
-            results["unused_js"] = (js_value / 1024) if js_value is not None else 0  # Convert to KB
-        
-        if "render-blocking-resources" in audits:
-            blocking_audit = audits["render-blocking-resources"]
-            if blocking_audit.get("details", {}).get("items"):
-                results["render_blocking_resources"] = len(blocking_audit["details"]["items"])
-        
-        # Issues from opportunities
+        # One pass over the audits fills metrics, item counts and opportunities
+        metric_audits = self.METRIC_AUDITS
+        item_count_audits = self.ITEM_COUNT_AUDITS
+        spec_audit_ids = self.SPEC_AUDIT_IDS
         opportunities = []
-        for key, audit in audits.items():
-            if audit.get("score", 1) < 0.9 and audit.get("description"):
+        for audit_id, audit in audits.items():
+            audit_get = audit.get
+            
+            # Load time metrics and optimization opportunities
+            if audit_id in spec_audit_ids:
+                spec = metric_audits.get(audit_id)
+                if spec is not None:
+                    key, scale = spec
+                    value = audit_get("numericValue")
+                    if value is None:
+                        results[key] = 0
+                    else:
+                        results[key] = value / scale if scale else value
+                elif items := audit_get("details", _EMPTY).get("items"):
+                    results[item_count_audits[audit_id]] = len(items)
+            
+            # Issues from opportunities (informative audits have a null score)
+            score = audit_get("score", 1)
+            if score is not None and score < 0.9 and (description := audit_get("description")):
                 opportunities.append({
-                    "id": key,
-                    "title": audit.get("title", key),
-                    "description": audit.get("description"),
-                    "impact": audit.get("numericValue", 0)
+                    "id": audit_id,
+                    "title": audit_get("title", audit_id),
+                    "description": description,
+                    "impact": audit_get("numericValue", 0)
                 })
         
-        results["issues"] = sorted(opportunities, key=lambda x: x["impact"], reverse=True)[:5]
+        results["issues"] = heapq.nlargest(5, opportunities, key=itemgetter("impact"))
         
         return results
     
@@ -189,87 +290,91 @@ class PerformanceAnalyzer:
         results = {}
         
         try:
-            async with httpx.AsyncClient(follow_redirects=True) as client:
-                # Measure basic load time with proper headers
-                headers = {
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                }
-                
-                logger.info(f"Running basic performance check for {domain}")
-                start = asyncio.get_event_loop().time()
-                response = await client.get(f"https://{domain}", timeout=15.0, headers=headers)
-                load_time = asyncio.get_event_loop().time() - start
-                
-                results["load_time"] = round(load_time, 2)
-                logger.info(f"Basic check for {domain}: load_time={load_time:.2f}s, status={response.status_code}")
-                
-                # Parse HTML for basic checks
-                soup = BeautifulSoup(response.text, 'lxml')
-                
-                # Count images without loading attribute
-                images = soup.find_all('img')
-                unoptimized = sum(1 for img in images if not img.get('loading'))
-                results["unoptimized_images"] = unoptimized
-                
-                # Count render-blocking resources
-                scripts = soup.find_all('script', src=True)
-                blocking_scripts = sum(1 for s in scripts if not s.get('async') and not s.get('defer'))
-                results["render_blocking_resources"] = blocking_scripts
-                
-                # Count CSS files
-                css_links = soup.find_all('link', rel='stylesheet')
-                results["css_files"] = len(css_links)
-                
-                # Check for large images
-                large_images = 0
-                for img in images:
-                    src = img.get('src', '')
-                    if any(ext in src.lower() for ext in ['.jpg', '.jpeg', '.png', '.gif', '.bmp']):
-                        if not any(opt in src.lower() for opt in ['thumb', 'small', 'icon', 'logo']):
-                            large_images += 1
-                results["large_images"] = large_images
-                
-                # More realistic score estimation based on multiple factors
-                score = 100
-                
-                # Deduct for load time
-                if load_time > 5:
-                    score -= 40
-                elif load_time > 3:
-                    score -= 25
-                elif load_time > 2:
-                    score -= 10
-                
-                # Deduct for unoptimized images
-                if unoptimized > 10:
-                    score -= 15
-                elif unoptimized > 5:
-                    score -= 10
-                elif unoptimized > 0:
-                    score -= 5
-                
-                # Deduct for render-blocking resources
-                if blocking_scripts > 5:
-                    score -= 20
-                elif blocking_scripts > 2:
-                    score -= 10
-                elif blocking_scripts > 0:
-                    score -= 5
-                
-                # Deduct for too many CSS files
-                if css_links and len(css_links) > 10:
-                    score -= 10
-                elif css_links and len(css_links) > 5:
-                    score -= 5
-                
-                results["score"] = max(0, score)
-                
-                # Add basic estimated metrics
-                results["first_contentful_paint"] = load_time * 0.3  # Rough estimate
-                results["time_to_interactive"] = load_time * 0.8  # Rough estimate
-                
-                logger.info(f"Basic performance score for {domain}: {results['score']}/100")
-                
+            client = get_http_client()
+            # Measure basic load time with proper headers
+            headers = {
+                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+            }
+            
+            logger.info(f"Running basic performance check for {domain}")
+            start = asyncio.get_event_loop().time()
+            response = await client.get(f"https://{domain}", timeout=15.0, headers=headers)
+            load_time = asyncio.get_event_loop().time() - start
+            
+            results["load_time"] = round(load_time, 2)
+            logger.info(f"Basic check for {domain}: load_time={load_time:.2f}s, status={response.status_code}")
+            
+            # Parse HTML for basic checks
+            tree = LexborHTMLParser(response.text)
+            
+            # Single walk over the resource elements the checks below need
+            unoptimized = 0
+            blocking_scripts = 0
+            css_files = 0
+            large_images = 0
+            for node in tree.css('img, script[src], link[rel~=stylesheet]'):
+                attrs = node.attributes
+                if node.tag == 'img':
+                    # Images without loading attribute
+                    if not attrs.get('loading'):
+                        unoptimized += 1
+                    # Large images
+                    src = (attrs.get('src') or '').lower()
+                    if _RASTER_IMAGE_RE.search(src) and not _SMALL_IMAGE_RE.search(src):
+                        large_images += 1
+                elif node.tag == 'script':
+                    # Render-blocking resources
+                    if 'async' not in attrs and 'defer' not in attrs:
+                        blocking_scripts += 1
+                else:
+                    css_files += 1
+            
+            results["unoptimized_images"] = unoptimized
+            results["render_blocking_resources"] = blocking_scripts
+            results["css_files"] = css_files
+            results["large_images"] = large_images
+            
+            # More realistic score estimation based on multiple factors
+            score = 100
+            
+            # Deduct for load time
+            if load_time > 5:
+                score -= 40
+            elif load_time > 3:
+                score -= 25
+            elif load_time > 2:
+                score -= 10
+            
+            # Deduct for unoptimized images
+            if unoptimized > 10:
+                score -= 15
+            elif unoptimized > 5:
+                score -= 10
+            elif unoptimized > 0:
+                score -= 5
+            
+            # Deduct for render-blocking resources
+            if blocking_scripts > 5:
+                score -= 20
+            elif blocking_scripts > 2:
+                score -= 10
+            elif blocking_scripts > 0:
+                score -= 5
+            
+            # Deduct for too many CSS files
+            if css_files > 10:
+                score -= 10
+            elif css_files > 5:
+                score -= 5
+            
+            results["score"] = max(0, score)
+            
+            # Add basic estimated metrics
+            results["first_contentful_paint"] = load_time * 0.3  # Rough estimate
+            results["time_to_interactive"] = load_time * 0.8  # Rough estimate
+            
+            logger.info(f"Basic performance score for {domain}: {results['score']}/100")
+            
         except httpx.TimeoutException:
             logger.error(f"Timeout while checking {domain}")
             results["score"] = 10
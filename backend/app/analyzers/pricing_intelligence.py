@@ -5,7 +5,8 @@ Extracts and analyzes pricing strategy from websites
 
 import httpx
 import re
-import json
+import orjson
+from operator import itemgetter
 from typing import Dict, Any, List, Optional, Tuple
 import structlog
 from bs4 import BeautifulSoup
@@ -16,6 +17,31 @@ from app.utils.cache import cache_result, get_cached_result
 
 logger = structlog.get_logger()
 
+# Currency symbols and patterns
+CURRENCY_SYMBOLS = {
+    '$': 'USD',
+    '€': 'EUR',
+    '£': 'GBP',
+    '¥': 'JPY',
+    '₹': 'INR',
+    'R$': 'BRL',
+    'A$': 'AUD',
+    'C$': 'CAD'
+}
+
+# Pricing model indicators
+SUBSCRIPTION_INDICATORS = (
+    '/month', '/mo', 'per month', 'monthly',
+    '/year', '/yr', 'per year', 'annual', 'yearly',
+    'subscription', 'subscribe', 'billed'
+)
+
+USAGE_BASED_INDICATORS = (
+    'per user', 'per seat', 'per gb', 'per api call',
+    'pay as you go', 'usage-based', 'per transaction',
+    'per employee', 'per contact', 'per lead'
+)
+
 
 class PricingIntelligenceAnalyzer:
     """
@@ -34,31 +60,6 @@ class PricingIntelligenceAnalyzer:
     def __init__(self):
         self.timeout = httpx.Timeout(20.0, connect=10.0)
         
-        # Currency symbols and patterns
-        self.currency_symbols = {
-            '$': 'USD',
-            '€': 'EUR',
-            '£': 'GBP',
-            '¥': 'JPY',
-            '₹': 'INR',
-            'R$': 'BRL',
-            'A$': 'AUD',
-            'C$': 'CAD'
-        }
-        
-        # Pricing model indicators
-        self.subscription_indicators = [
-            '/month', '/mo', 'per month', 'monthly',
-            '/year', '/yr', 'per year', 'annual', 'yearly',
-            'subscription', 'subscribe', 'billed'
-        ]
-        
-        self.usage_based_indicators = [
-            'per user', 'per seat', 'per gb', 'per api call',
-            'pay as you go', 'usage-based', 'per transaction',
-            'per employee', 'per contact', 'per lead'
-        ]
-        
     async def analyze(self, domain: str, competitor_domains: Optional[List[str]] = None) -> Dict[str, Any]:
         """
         Extract and analyze pricing intelligence
@@ -166,7 +167,7 @@ class PricingIntelligenceAnalyzer:
                             pricing_response = await client.get(absolute_url, follow_redirects=True)
                             if pricing_response.status_code == 200:
                                 # Check if page contains pricing information
-                                if any(symbol in pricing_response.text for symbol in self.currency_symbols.keys()):
+                                if any(symbol in pricing_response.text for symbol in CURRENCY_SYMBOLS.keys()):
                                     return absolute_url
                         except:
                             continue
@@ -178,7 +179,7 @@ class PricingIntelligenceAnalyzer:
                         test_url = f"https://{domain}{path}"
                         test_response = await client.get(test_url, follow_redirects=True)
                         if test_response.status_code == 200:
-                            if any(symbol in test_response.text for symbol in self.currency_symbols.keys()):
+                            if any(symbol in test_response.text for symbol in CURRENCY_SYMBOLS.keys()):
                                 return test_url
                     except:
                         continue
@@ -209,7 +210,7 @@ class PricingIntelligenceAnalyzer:
                 json_ld = soup.find('script', type='application/ld+json')
                 if json_ld:
                     try:
-                        data["structured_data"] = json.loads(json_ld.string)
+                        data["structured_data"] = orjson.loads(str(json_ld.string))
                     except:
                         pass
                 
@@ -249,7 +250,7 @@ class PricingIntelligenceAnalyzer:
                 
                 prices.append({
                     "amount": amount,
-                    "currency": self.currency_symbols.get(currency_symbol, "USD"),
+                    "currency": CURRENCY_SYMBOLS.get(currency_symbol, "USD"),
                     "period": context.get("period"),
                     "tier": context.get("tier"),
                     "raw": match
@@ -275,7 +276,7 @@ class PricingIntelligenceAnalyzer:
                         
                         prices.append({
                             "amount": amount,
-                            "currency": self.currency_symbols.get(currency_symbol, "USD"),
+                            "currency": CURRENCY_SYMBOLS.get(currency_symbol, "USD"),
                             "tier": tier_name,
                             "raw": match
                         })
@@ -291,7 +292,7 @@ class PricingIntelligenceAnalyzer:
                 seen.add(key)
                 unique_prices.append(price)
         
-        return sorted(unique_prices, key=lambda x: x["amount"])
+        return sorted(unique_prices, key=itemgetter("amount"))
     
     def _find_price_context(self, price: str, text: str) -> Dict[str, str]:
         """Find the context around a price (period, tier name, etc.)"""
@@ -306,7 +307,7 @@ class PricingIntelligenceAnalyzer:
             surrounding = text[start:end].lower()
             
             # Check for period
-            for indicator in self.subscription_indicators:
+            for indicator in SUBSCRIPTION_INDICATORS:
                 if indicator in surrounding:
                     if 'month' in indicator:
                         context["period"] = "monthly"
@@ -420,13 +421,13 @@ class PricingIntelligenceAnalyzer:
         raw_text = pricing_data.get("raw_text", "").lower()
         
         # Check for subscription
-        if any(indicator in raw_text for indicator in self.subscription_indicators):
-            if any(indicator in raw_text for indicator in self.usage_based_indicators):
+        if any(indicator in raw_text for indicator in SUBSCRIPTION_INDICATORS):
+            if any(indicator in raw_text for indicator in USAGE_BASED_INDICATORS):
                 return "hybrid_subscription_usage"
             return "subscription"
         
         # Check for usage-based
-        if any(indicator in raw_text for indicator in self.usage_based_indicators):
+        if any(indicator in raw_text for indicator in USAGE_BASED_INDICATORS):
             return "usage_based"
         
         # Check for one-time
@@ -759,7 +760,7 @@ class PricingIntelligenceAnalyzer:
         
         # Usage-based components
         raw_text = pricing_data.get("raw_text", "").lower()
-        if any(indicator in raw_text for indicator in self.usage_based_indicators):
+        if any(indicator in raw_text for indicator in USAGE_BASED_INDICATORS):
             complexity_score += 1
         
         # Hidden costs
@@ -5,6 +5,7 @@ dynamic content, and actual page behavior
 """
 
 import asyncio
+import re
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 import structlog
@@ -25,6 +26,21 @@ from app.utils.cache import cache_result, get_cached_result
 
 logger = structlog.get_logger()
 
+# Third-party services whose failures break user-facing functionality
+CRITICAL_SERVICES = {
+    "googleapis.com": "Google APIs",
+    "stripe.com": "Payment processing",
+    "googletagmanager.com": "Google Tag Manager",
+    "google-analytics.com": "Google Analytics",
+    "facebook.com": "Facebook SDK",
+    "intercom.io": "Customer support chat",
+    "hotjar.com": "User analytics",
+    "segment.com": "Analytics platform"
+}
+
+# All service domains in one alternation so each failing domain is classified in a single scan
+_CRITICAL_SERVICE_RE = re.compile("|".join(map(re.escape, CRITICAL_SERVICES)))
+
 
 class RealtimeBrowserAnalyzer:
     """
@@ -310,8 +326,8 @@ class RealtimeBrowserAnalyzer:
                 password_field = await form.query_selector("input[type='password']")
                 if password_field:
                     # Look for complexity requirements
-                    page_text = await page.content()
-                    if any(req in page_text.lower() for req in 
+                    page_text = (await page.content()).lower()
+                    if any(req in page_text for req in 
                            ["8 characters", "uppercase", "special character", "number"]):
                         issues.append({
                             "form_index": i,
@@ -481,27 +497,17 @@ class RealtimeBrowserAnalyzer:
                 third_party_errors[domain].append(error)
         
         # Identify critical failures
-        critical_services = {
-            "googleapis.com": "Google APIs",
-            "stripe.com": "Payment processing",
-            "googletagmanager.com": "Google Tag Manager",
-            "google-analytics.com": "Google Analytics",
-            "facebook.com": "Facebook SDK",
-            "intercom.io": "Customer support chat",
-            "hotjar.com": "User analytics",
-            "segment.com": "Analytics platform"
-        }
-        
         for domain, errors in third_party_errors.items():
-            for service_domain, service_name in critical_services.items():
-                if service_domain in domain:
-                    failures.append({
-                        "service": service_name,
-                        "domain": domain,
-                        "error_count": len(errors),
-                        "impact": f"{service_name} functionality broken",
-                        "critical": service_name in ["Payment processing", "Customer support chat"]
-                    })
+            matched = dict.fromkeys(match.group() for match in _CRITICAL_SERVICE_RE.finditer(domain))
+            for service_domain in matched:
+                service_name = CRITICAL_SERVICES[service_domain]
+                failures.append({
+                    "service": service_name,
+                    "domain": domain,
+                    "error_count": len(errors),
+                    "impact": f"{service_name} functionality broken",
+                    "critical": service_name in ["Payment processing", "Customer support chat"]
+                })
         
         return failures
     
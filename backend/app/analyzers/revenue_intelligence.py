@@ -1,13 +1,17 @@
 import httpx
 import asyncio
+import heapq
 from typing import Dict, Any, List, Optional
 import re
 import json
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 import structlog
+from operator import itemgetter
 from urllib.parse import urljoin, urlparse
 
 from app.config import settings
+from app.analyzers.mobile import MobileAnalyzer
+from app.analyzers.performance import PerformanceAnalyzer
 from app.utils.cache import cache_result, get_cached_result
 
 logger = structlog.get_logger()
@@ -21,6 +25,7 @@ class RevenueIntelligenceAnalyzer:
     
     def __init__(self):
         self.timeout = httpx.Timeout(30.0, connect=10.0)
+        self.performance_analyzer = PerformanceAnalyzer()
         
     async def analyze(self, domain: str, industry: str = None) -> Dict[str, Any]:
         """
@@ -54,19 +59,23 @@ class RevenueIntelligenceAnalyzer:
         try:
             async with httpx.AsyncClient(timeout=self.timeout) as client:
                 # Fetch homepage and key pages
-                pages_to_analyze = await self._identify_key_pages(domain, client)
+                responses: Dict[str, httpx.Response] = {}
+                pages_to_analyze = await self._identify_key_pages(domain, client, responses)
+                
+                # Fetch each page once; the page analyses below share these responses
+                await self._fetch_pages(pages_to_analyze, client, responses)
                 
                 # Run all analyses in parallel
                 tasks = [
-                    self._analyze_javascript_errors(domain, pages_to_analyze, client),
-                    self._analyze_checkout_flow(domain, pages_to_analyze, client),
-                    self._analyze_pricing_strategy(domain, pages_to_analyze, client),
-                    self._analyze_forms(domain, pages_to_analyze, client),
-                    self._analyze_trust_signals(domain, pages_to_analyze, client),
-                    self._analyze_urgency_scarcity(domain, pages_to_analyze, client),
-                    self._analyze_upsell_cross_sell(domain, pages_to_analyze, client),
+                    self._analyze_javascript_errors(domain, pages_to_analyze, responses),
+                    self._analyze_checkout_flow(domain, pages_to_analyze, responses),
+                    self._analyze_pricing_strategy(domain, pages_to_analyze, responses),
+                    self._analyze_forms(domain, pages_to_analyze, responses),
+                    self._analyze_trust_signals(domain, pages_to_analyze, responses),
+                    self._analyze_urgency_scarcity(domain, pages_to_analyze, responses),
+                    self._analyze_upsell_cross_sell(domain, pages_to_analyze, responses),
                     self._analyze_mobile_conversion(domain, client),
-                    self._analyze_page_speed_revenue_impact(domain, client),
+                    self._analyze_page_speed_revenue_impact(domain),
                     self._analyze_competitor_pricing(domain, industry, client)
                 ]
                 
@@ -121,7 +130,7 @@ class RevenueIntelligenceAnalyzer:
             logger.error(f"Revenue intelligence analysis failed for {domain}", error=str(e))
             return results
     
-    async def _identify_key_pages(self, domain: str, client: httpx.AsyncClient) -> Dict[str, str]:
+    async def _identify_key_pages(self, domain: str, client: httpx.AsyncClient, responses: Dict[str, httpx.Response]) -> Dict[str, str]:
         """Identify critical conversion pages to analyze"""
         pages = {
             "home": f"https://{domain}",
@@ -137,8 +146,9 @@ class RevenueIntelligenceAnalyzer:
         try:
             # Get homepage to find links
             response = await client.get(pages["home"], follow_redirects=True)
+            responses[pages["home"]] = response
             if response.status_code == 200:
-                soup = BeautifulSoup(response.text, 'html.parser')
+                soup = BeautifulSoup(response.text, 'html.parser', parse_only=SoupStrainer('a', href=True))
                 
                 # Find key pages through common patterns
                 for link in soup.find_all('a', href=True):
@@ -179,7 +189,21 @@ class RevenueIntelligenceAnalyzer:
         # Remove None values
         return {k: v for k, v in pages.items() if v}
     
-    async def _analyze_javascript_errors(self, domain: str, pages: Dict[str, str], client: httpx.AsyncClient) -> Dict[str, Any]:
+    async def _fetch_pages(self, pages: Dict[str, str], client: httpx.AsyncClient, responses: Dict[str, httpx.Response]) -> None:
+        """Fetch each key page URL once so every page analysis reuses the same response"""
+        urls = [url for url in set(pages.values()) if url not in responses]
+        fetched = await asyncio.gather(
+            *(client.get(url, follow_redirects=True) for url in urls),
+            return_exceptions=True
+        )
+        
+        for url, response in zip(urls, fetched):
+            if isinstance(response, Exception):
+                logger.debug(f"Error fetching {url}", error=str(response))
+            else:
+                responses[url] = response
+    
+    async def _analyze_javascript_errors(self, domain: str, pages: Dict[str, str], responses: Dict[str, httpx.Response]) -> Dict[str, Any]:
         """Detect JavaScript errors that could be killing conversions"""
         blockers = []
         
@@ -188,8 +212,8 @@ class RevenueIntelligenceAnalyzer:
                 continue
                 
             try:
-                response = await client.get(url, follow_redirects=True)
-                if response.status_code == 200:
+                response = responses.get(url)
+                if response is not None and response.status_code == 200:
                     soup = BeautifulSoup(response.text, 'html.parser')
                     
                     # Check for common JS error patterns
@@ -227,7 +251,7 @@ class RevenueIntelligenceAnalyzer:
         
         return {"blockers": blockers}
     
-    async def _analyze_checkout_flow(self, domain: str, pages: Dict[str, str], client: httpx.AsyncClient) -> Dict[str, Any]:
+    async def _analyze_checkout_flow(self, domain: str, pages: Dict[str, str], responses: Dict[str, httpx.Response]) -> Dict[str, Any]:
         """Analyze checkout/signup flow for conversion killers"""
         issues = []
         
@@ -246,8 +270,8 @@ class RevenueIntelligenceAnalyzer:
         for page_type in ['signup', 'checkout', 'demo']:
             if url := pages.get(page_type):
                 try:
-                    response = await client.get(url, follow_redirects=True)
-                    if response.status_code == 200:
+                    response = responses.get(url)
+                    if response is not None and response.status_code == 200:
                         soup = BeautifulSoup(response.text, 'html.parser')
                         
                         # Count form fields
@@ -300,14 +324,14 @@ class RevenueIntelligenceAnalyzer:
         
         return {"issues": issues}
     
-    async def _analyze_pricing_strategy(self, domain: str, pages: Dict[str, str], client: httpx.AsyncClient) -> Dict[str, Any]:
+    async def _analyze_pricing_strategy(self, domain: str, pages: Dict[str, str], responses: Dict[str, httpx.Response]) -> Dict[str, Any]:
         """Analyze pricing strategy for revenue opportunities"""
         opportunities = []
         
         if pricing_url := pages.get("pricing"):
             try:
-                response = await client.get(pricing_url, follow_redirects=True)
-                if response.status_code == 200:
+                response = responses.get(pricing_url)
+                if response is not None and response.status_code == 200:
                     content = response.text.lower()
                     soup = BeautifulSoup(response.text, 'html.parser')
                     
@@ -381,7 +405,7 @@ class RevenueIntelligenceAnalyzer:
         
         return {"opportunities": opportunities}
     
-    async def _analyze_forms(self, domain: str, pages: Dict[str, str], client: httpx.AsyncClient) -> Dict[str, Any]:
+    async def _analyze_forms(self, domain: str, pages: Dict[str, str], responses: Dict[str, httpx.Response]) -> Dict[str, Any]:
         """Analyze forms for conversion optimization"""
         optimizations = []
         
@@ -390,8 +414,8 @@ class RevenueIntelligenceAnalyzer:
                 continue
             
             try:
-                response = await client.get(url, follow_redirects=True)
-                if response.status_code == 200:
+                response = responses.get(url)
+                if response is not None and response.status_code == 200:
                     soup = BeautifulSoup(response.text, 'html.parser')
                     forms = soup.find_all('form')
                     
@@ -444,15 +468,15 @@ class RevenueIntelligenceAnalyzer:
         
         return {"optimizations": optimizations}
     
-    async def _analyze_trust_signals(self, domain: str, pages: Dict[str, str], client: httpx.AsyncClient) -> Dict[str, Any]:
+    async def _analyze_trust_signals(self, domain: str, pages: Dict[str, str], responses: Dict[str, httpx.Response]) -> Dict[str, Any]:
         """Analyze missing trust signals that impact conversion"""
         missing_signals = []
         
         try:
             # Check homepage for trust signals
             if home_url := pages.get("home"):
-                response = await client.get(home_url, follow_redirects=True)
-                if response.status_code == 200:
+                response = responses.get(home_url)
+                if response is not None and response.status_code == 200:
                     content = response.text.lower()
                     soup = BeautifulSoup(response.text, 'html.parser')
                     
@@ -517,7 +541,7 @@ class RevenueIntelligenceAnalyzer:
         
         return {"missing_signals": missing_signals}
     
-    async def _analyze_urgency_scarcity(self, domain: str, pages: Dict[str, str], client: httpx.AsyncClient) -> Dict[str, Any]:
+    async def _analyze_urgency_scarcity(self, domain: str, pages: Dict[str, str], responses: Dict[str, httpx.Response]) -> Dict[str, Any]:
         """Analyze use of urgency and scarcity tactics"""
         missing_urgency = []
         
@@ -525,8 +549,8 @@ class RevenueIntelligenceAnalyzer:
             # Check pricing and signup pages for urgency elements
             for page_type in ['pricing', 'signup', 'home']:
                 if url := pages.get(page_type):
-                    response = await client.get(url, follow_redirects=True)
-                    if response.status_code == 200:
+                    response = responses.get(url)
+                    if response is not None and response.status_code == 200:
                         content = response.text.lower()
                         
                         # Check for urgency indicators
@@ -565,14 +589,14 @@ class RevenueIntelligenceAnalyzer:
         
         return {"missing_urgency": missing_urgency}
     
-    async def _analyze_upsell_cross_sell(self, domain: str, pages: Dict[str, str], client: httpx.AsyncClient) -> Dict[str, Any]:
+    async def _analyze_upsell_cross_sell(self, domain: str, pages: Dict[str, str], responses: Dict[str, httpx.Response]) -> Dict[str, Any]:
         """Analyze upsell and cross-sell opportunities"""
         opportunities = []
         
         try:
             if pricing_url := pages.get("pricing"):
-                response = await client.get(pricing_url, follow_redirects=True)
-                if response.status_code == 200:
+                response = responses.get(pricing_url)
+                if response is not None and response.status_code == 200:
                     content = response.text.lower()
                     
                     # Check for add-ons or extras
@@ -628,11 +652,7 @@ class RevenueIntelligenceAnalyzer:
         
         try:
             # Simulate mobile user agent
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (iPhone; CPU iPhone OS 14_0 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.0 Mobile/15E148 Safari/604.1'
-            }
-            
-            response = await client.get(f"https://{domain}", headers=headers, follow_redirects=True)
+            response = await client.get(f"https://{domain}", headers=MobileAnalyzer.MOBILE_HEADERS, follow_redirects=True)
             if response.status_code == 200:
                 soup = BeautifulSoup(response.text, 'html.parser')
                 
@@ -678,21 +698,20 @@ class RevenueIntelligenceAnalyzer:
         
         return {"mobile_issues": mobile_issues}
     
-    async def _analyze_page_speed_revenue_impact(self, domain: str, client: httpx.AsyncClient) -> Dict[str, Any]:
+    async def _analyze_page_speed_revenue_impact(self, domain: str) -> Dict[str, Any]:
         """Calculate revenue impact of page speed issues"""
         try:
-            # Use PageSpeed API if available, otherwise estimate
+            # Use PageSpeed API if available, otherwise estimate. Shares the
+            # request PerformanceAnalyzer makes for the same domain.
             if settings.GOOGLE_PAGESPEED_API_KEY:
-                url = f"https://www.googleapis.com/pagespeedonline/v5/runPagespeed?url=https://{domain}&key={settings.GOOGLE_PAGESPEED_API_KEY}"
-                response = await client.get(url)
+                data = await self.performance_analyzer.get_pagespeed_data(domain)
                 
-                if response.status_code == 200:
-                    data = response.json()
+                if data:
                     metrics = data.get('lighthouseResult', {}).get('audits', {})
                     
                     # Get key metrics
-                    fcp = metrics.get('first-contentful-paint', {}).get('numericValue', 0) / 1000
-                    lcp = metrics.get('largest-contentful-paint', {}).get('numericValue', 0) / 1000
+                    lcp_audit = metrics.get('largest-contentful-paint')
+                    lcp = lcp_audit.get('numericValue', 0) / 1000 if lcp_audit else 0
                     
                     if lcp > 4:  # Poor LCP
                         return {
@@ -770,5 +789,5 @@ class RevenueIntelligenceAnalyzer:
                         "impact": issue.get('monthly_impact', 0)
                     })
         
-        # Sort by impact
-        return sorted(quick_fixes, key=lambda x: x.get('impact', 0), reverse=True)[:5]
\ No newline at end of file
+        # Top 5 by impact
+        return heapq.nlargest(5, quick_fixes, key=itemgetter('impact'))
\ No newline at end of file
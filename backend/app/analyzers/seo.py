@@ -1,17 +1,25 @@
-import httpx
+import asyncio
+import hashlib
+import re
 from typing import Dict, Any
 import structlog
-from bs4 import BeautifulSoup
-import re
+from selectolax.lexbor import LexborHTMLParser
 
 from app.utils.cache import cache_result, get_cached_result
+from app.utils.http_client import fetch_capped, fetch_robots_txt
 
 logger = structlog.get_logger()
 
+# Page signals depend only on the HTML (and the domain, for internal links),
+# so they outlive the per-domain report cache while the page is unchanged
+PAGE_SIGNALS_TTL = 86400
+
 
 class SEOAnalyzer:
     def __init__(self):
         self.ai_crawlers = ['GPTBot', 'ChatGPT-User', 'CCBot', 'Claude-Web', 'PerplexityBot']
+        # One alternation finds every crawler name in a single scan of robots.txt
+        self._ai_crawler_re = re.compile('|'.join(re.escape(bot.lower()) for bot in self.ai_crawlers))
     
     async def analyze(self, domain: str) -> Dict[str, Any]:
         cache_key = f"seo:{domain}"
@@ -33,165 +41,185 @@ class SEOAnalyzer:
         }
         
         try:
-            async with httpx.AsyncClient() as client:
-                # Fetch homepage
-                response = await client.get(f"https://{domain}", timeout=10.0, follow_redirects=True)
-                soup = BeautifulSoup(response.text, 'lxml')
-                
-                # Check robots.txt for AI crawler blocking
-                robots_response = await client.get(f"https://{domain}/robots.txt", timeout=5.0)
-                if robots_response.status_code == 200:
-                    robots_txt = robots_response.text.lower()
-                    for bot in self.ai_crawlers:
-                        if bot.lower() in robots_txt and 'disallow' in robots_txt:
-                            results["blocks_ai_crawlers"] = True
-                            results["issues"].append({
-                                "type": "ai_visibility",
-                                "severity": "critical",
-                                "message": f"Blocking {bot} - invisible to AI search"
-                            })
-                
-                # Meta tags
-                title = soup.find('title')
-                if title:
-                    results["meta_title"] = title.text.strip()
-                    if len(results["meta_title"]) > 60:
+            # Fetch homepage
+            _, body, encoding = await fetch_capped(f"https://{domain}")
+            
+            content_hash = hashlib.blake2b(body, digest_size=16).hexdigest()
+            signals_key = f"seo_page:{domain}:{content_hash}"
+            page = await get_cached_result(signals_key)
+            if not page:
+                # Parsing is CPU-bound; run it off the event loop
+                page = await asyncio.to_thread(
+                    self._extract_page_signals, body.decode(encoding, errors='replace'), domain
+                )
+                await cache_result(signals_key, page, ttl=PAGE_SIGNALS_TTL)
+            
+            # Check robots.txt for AI crawler blocking
+            robots_txt = await fetch_robots_txt(domain, timeout=5.0)
+            if robots_txt is not None:
+                named_bots = set(self._ai_crawler_re.findall(robots_txt)) if 'disallow' in robots_txt else set()
+                for bot in self.ai_crawlers:
+                    if bot.lower() in named_bots:
+                        results["blocks_ai_crawlers"] = True
                         results["issues"].append({
-                            "type": "meta",
-                            "severity": "medium",
-                            "message": "Title too long (>60 chars)"
+                            "type": "ai_visibility",
+                            "severity": "critical",
+                            "message": f"Blocking {bot} - invisible to AI search"
                         })
-                else:
+            
+            # Meta tags
+            if page["meta_title"] is not None:
+                results["meta_title"] = page["meta_title"]
+                if len(results["meta_title"]) > 60:
                     results["issues"].append({
                         "type": "meta",
-                        "severity": "high",
-                        "message": "Missing page title"
+                        "severity": "medium",
+                        "message": "Title too long (>60 chars)"
                     })
-                
-                # Meta description
-                meta_desc = soup.find('meta', attrs={'name': 'description'})
-                if meta_desc:
-                    results["meta_description"] = meta_desc.get('content', '')
-                    if len(results["meta_description"]) > 160:
-                        results["issues"].append({
-                            "type": "meta",
-                            "severity": "medium",
-                            "message": "Description too long (>160 chars)"
-                        })
-                else:
+            else:
+                results["issues"].append({
+                    "type": "meta",
+                    "severity": "high",
+                    "message": "Missing page title"
+                })
+            
+            # Meta description
+            if page["meta_description"] is not None:
+                results["meta_description"] = page["meta_description"]
+                if len(results["meta_description"]) > 160:
                     results["issues"].append({
                         "type": "meta",
-                        "severity": "high",
-                        "message": "Missing meta description"
-                    })
-                
-                # H1 tags
-                h1_tags = soup.find_all('h1')
-                results["h1_count"] = len(h1_tags)
-                if results["h1_count"] == 0:
-                    results["issues"].append({
-                        "type": "structure",
-                        "severity": "high",
-                        "message": "No H1 tag found"
-                    })
-                elif results["h1_count"] > 1:
-                    results["issues"].append({
-                        "type": "structure",
                         "severity": "medium",
-                        "message": f"Multiple H1 tags ({results['h1_count']})"
+                        "message": "Description too long (>160 chars)"
                     })
-                
-                # Open Graph tags
-                og_tags = soup.find_all('meta', property=re.compile(r'^og:'))
-                results["has_og_tags"] = len(og_tags) > 0
-                if not results["has_og_tags"]:
-                    results["opportunities"].append({
-                        "type": "social",
-                        "message": "Add Open Graph tags for better social sharing"
-                    })
-                
-                # Schema markup
-                schema_scripts = soup.find_all('script', type='application/ld+json')
-                results["has_schema"] = len(schema_scripts) > 0
-                if not results["has_schema"]:
-                    results["opportunities"].append({
-                        "type": "structured_data",
-                        "message": "Add Schema.org markup for rich snippets"
-                    })
-                
-                # Calculate AI visibility score
-                ai_score = 100
-                if results["blocks_ai_crawlers"]:
-                    ai_score -= 50
-                if not results["has_schema"]:
-                    ai_score -= 20
-                if not results["meta_description"]:
-                    ai_score -= 15
-                if results["h1_count"] != 1:
-                    ai_score -= 15
-                results["ai_visibility_score"] = max(0, ai_score)
-                
-                # Find additional opportunities
-                # Check for advanced SEO features
-                if not soup.find('link', rel='canonical'):
-                    results["opportunities"].append({
-                        "type": "technical",
-                        "message": "Add canonical tags to prevent duplicate content issues",
-                        "impact": "medium"
-                    })
-                
-                # Check for image optimization
-                images_without_alt = sum(1 for img in soup.find_all('img') if not img.get('alt'))
-                if images_without_alt > 0:
-                    results["opportunities"].append({
-                        "type": "accessibility",
-                        "message": f"{images_without_alt} images missing alt text - hurts SEO and accessibility",
-                        "impact": "high"
-                    })
-                
-                # Check for internal linking
-                internal_links = [a for a in soup.find_all('a', href=True) 
-                                if a['href'].startswith('/') or domain in a.get('href', '')]
-                if len(internal_links) < 10:
-                    results["opportunities"].append({
-                        "type": "internal_linking",
-                        "message": "Weak internal linking structure - add more contextual links",
-                        "impact": "medium"
-                    })
-                
-                # Check for FAQ schema
-                if 'faq' not in response.text.lower() and not soup.find(attrs={'itemtype': re.compile('FAQPage')}):
-                    results["opportunities"].append({
-                        "type": "rich_snippets",
-                        "message": "Add FAQ schema for rich snippets in search results",
-                        "impact": "high"
-                    })
-                
-                # Calculate realistic SEO score (nobody gets 100)
-                score = 40  # Base score
-                if results["meta_title"]:
-                    score += 8
-                if results["meta_description"]:
-                    score += 8
-                if results["h1_count"] == 1:
-                    score += 8
-                if results["has_og_tags"]:
-                    score += 6
-                if results["has_schema"]:
-                    score += 10
-                if not results["blocks_ai_crawlers"]:
-                    score += 15
-                
-                # Deduct for issues and missing opportunities
-                score -= len(results["issues"]) * 5
-                score -= len(results["opportunities"]) * 3
-                
-                # Cap at 85 - perfect SEO is a myth
-                results["score"] = max(20, min(85, score))
-                
-                await cache_result(cache_key, results, ttl=3600)
-                
+            else:
+                results["issues"].append({
+                    "type": "meta",
+                    "severity": "high",
+                    "message": "Missing meta description"
+                })
+            
+            # H1 tags
+            results["h1_count"] = page["h1_count"]
+            if results["h1_count"] == 0:
+                results["issues"].append({
+                    "type": "structure",
+                    "severity": "high",
+                    "message": "No H1 tag found"
+                })
+            elif results["h1_count"] > 1:
+                results["issues"].append({
+                    "type": "structure",
+                    "severity": "medium",
+                    "message": f"Multiple H1 tags ({results['h1_count']})"
+                })
+            
+            # Open Graph tags
+            results["has_og_tags"] = page["has_og_tags"]
+            if not results["has_og_tags"]:
+                results["opportunities"].append({
+                    "type": "social",
+                    "message": "Add Open Graph tags for better social sharing"
+                })
+            
+            # Schema markup
+            results["has_schema"] = page["has_schema"]
+            if not results["has_schema"]:
+                results["opportunities"].append({
+                    "type": "structured_data",
+                    "message": "Add Schema.org markup for rich snippets"
+                })
+            
+            # Calculate AI visibility score
+            ai_score = 100
+            if results["blocks_ai_crawlers"]:
+                ai_score -= 50
+            if not results["has_schema"]:
+                ai_score -= 20
+            if not results["meta_description"]:
+                ai_score -= 15
+            if results["h1_count"] != 1:
+                ai_score -= 15
+            results["ai_visibility_score"] = max(0, ai_score)
+            
+            # Find additional opportunities
+            # Check for advanced SEO features
+            if not page["has_canonical"]:
+                results["opportunities"].append({
+                    "type": "technical",
+                    "message": "Add canonical tags to prevent duplicate content issues",
+                    "impact": "medium"
+                })
+            
+            # Check for image optimization
+            images_without_alt = page["images_without_alt"]
+            if images_without_alt > 0:
+                results["opportunities"].append({
+                    "type": "accessibility",
+                    "message": f"{images_without_alt} images missing alt text - hurts SEO and accessibility",
+                    "impact": "high"
+                })
+            
+            # Check for internal linking
+            if page["internal_links"] < 10:
+                results["opportunities"].append({
+                    "type": "internal_linking",
+                    "message": "Weak internal linking structure - add more contextual links",
+                    "impact": "medium"
+                })
+            
+            # Check for FAQ schema
+            if not page["has_faq"]:
+                results["opportunities"].append({
+                    "type": "rich_snippets",
+                    "message": "Add FAQ schema for rich snippets in search results",
+                    "impact": "high"
+                })
+            
+            # Calculate realistic SEO score (nobody gets 100)
+            score = 40  # Base score
+            if results["meta_title"]:
+                score += 8
+            if results["meta_description"]:
+                score += 8
+            if results["h1_count"] == 1:
+                score += 8
+            if results["has_og_tags"]:
+                score += 6
+            if results["has_schema"]:
+                score += 10
+            if not results["blocks_ai_crawlers"]:
+                score += 15
+            
+            # Deduct for issues and missing opportunities
+            score -= len(results["issues"]) * 5
+            score -= len(results["opportunities"]) * 3
+            
+            # Cap at 85 - perfect SEO is a myth
+            results["score"] = max(20, min(85, score))
+            
+            await cache_result(cache_key, results, ttl=3600)
+            
         except Exception as e:
             logger.error("SEO analysis failed", domain=domain, error=str(e))
         
-        return results
\ No newline at end of file
+        return results
+    
+    def _extract_page_signals(self, html: str, domain: str) -> Dict[str, Any]:
+        """Pull the SEO-relevant facts out of the homepage HTML"""
+        tree = LexborHTMLParser(html)
+        title = tree.css_first('title')
+        meta_desc = tree.css_first('meta[name="description"]')
+        
+        return {
+            "meta_title": title.text().strip() if title else None,
+            "meta_description": (meta_desc.attributes.get('content') or '') if meta_desc else None,
+            "h1_count": len(tree.css('h1')),
+            "has_og_tags": tree.css_first('meta[property^="og:"]') is not None,
+            "has_schema": tree.css_first('script[type="application/ld+json"]') is not None,
+            "has_canonical": tree.css_first('link[rel~=canonical]') is not None,
+            "images_without_alt": sum(1 for img in tree.css('img') if not img.attributes.get('alt')),
+            "internal_links": sum(1 for a in tree.css('a[href]')
+                                  if (href := a.attributes.get('href') or '').startswith('/') or domain in href),
+            "has_faq": 'faq' in html.lower() or tree.css_first('[itemtype*="FAQPage"]') is not None
+        }
@@ -2,14 +2,34 @@ import httpx
 import re
 import json
 from typing import Dict, Any, List, Optional
-from bs4 import BeautifulSoup
 import structlog
+from selectolax.lexbor import LexborHTMLParser
 
 from app.config import settings
 from app.utils.cache import cache_result, get_cached_result
 
 logger = structlog.get_logger()
 
+# Social platform profile URL patterns, compiled once
+SOCIAL_PATTERNS = {
+    "twitter": re.compile(r'(?:twitter\.com|x\.com)/([A-Za-z0-9_]+)', re.I),
+    "linkedin": re.compile(r'linkedin\.com/company/([A-Za-z0-9-]+)', re.I),
+    "facebook": re.compile(r'facebook\.com/([A-Za-z0-9.]+)', re.I),
+    "instagram": re.compile(r'instagram\.com/([A-Za-z0-9_.]+)', re.I),
+    "youtube": re.compile(r'youtube\.com/(?:c/|channel/|@)([A-Za-z0-9_-]+)', re.I),
+    "github": re.compile(r'github\.com/([A-Za-z0-9-]+)', re.I)
+}
+
+FOLLOWER_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    r'(\d+[kKmM]?)\s*followers?',
+    r'(\d+[kKmM]?)\s*subscribers?',
+    r'(\d+[kKmM]?)\s*members?',
+    r'trusted by\s*(\d+[kKmM]?)',
+    r'(\d+[kKmM]?)\s*customers?'
+))
+
+_LOGO_CLASS_RE = re.compile(r'logos?|clients?|partners?|trusted', re.I)
+
 
 class SocialAnalyzer:
     """Analyzes social media presence and engagement"""
@@ -58,33 +78,23 @@ class SocialAnalyzer:
         try:
             async with httpx.AsyncClient() as client:
                 response = await client.get(f"https://{domain}", timeout=10.0, follow_redirects=True)
-                soup = BeautifulSoup(response.text, 'lxml')
-                
-                # Social platform patterns
-                social_patterns = {
-                    "twitter": r'(?:twitter\.com|x\.com)/([A-Za-z0-9_]+)',
-                    "linkedin": r'linkedin\.com/company/([A-Za-z0-9-]+)',
-                    "facebook": r'facebook\.com/([A-Za-z0-9.]+)',
-                    "instagram": r'instagram\.com/([A-Za-z0-9_.]+)',
-                    "youtube": r'youtube\.com/(?:c/|channel/|@)([A-Za-z0-9_-]+)',
-                    "github": r'github\.com/([A-Za-z0-9-]+)'
-                }
+                tree = LexborHTMLParser(response.text)
+                hrefs = [node.attributes.get('href') or '' for node in tree.css('a[href]')]
                 
                 profiles = {}
                 total_followers = 0
                 
-                for platform, pattern in social_patterns.items():
-                    links = soup.find_all('a', href=re.compile(pattern, re.I))
-                    if links:
-                        match = re.search(pattern, links[0].get('href', ''), re.I)
-                        if match:
-                            username = match.group(1)
-                            profiles[platform] = {
-                                "username": username,
-                                "url": links[0].get('href'),
-                                "followers": await self._estimate_followers(platform, username)
-                            }
-                            total_followers += profiles[platform]["followers"]
+                for platform, pattern in SOCIAL_PATTERNS.items():
+                    # First link pointing at this platform
+                    match = next((m for href in hrefs if (m := pattern.search(href))), None)
+                    if match:
+                        username = match.group(1)
+                        profiles[platform] = {
+                            "username": username,
+                            "url": match.string,
+                            "followers": await self._estimate_followers(platform, username)
+                        }
+                        total_followers += profiles[platform]["followers"]
                 
                 results["social_profiles"] = profiles
                 results["total_followers"] = total_followers
@@ -111,22 +121,14 @@ class SocialAnalyzer:
         try:
             async with httpx.AsyncClient() as client:
                 response = await client.get(f"https://{domain}", timeout=10.0)
-                soup = BeautifulSoup(response.text, 'lxml')
+                tree = LexborHTMLParser(response.text)
                 text_lower = response.text.lower()
                 
                 social_proof = []
                 
                 # Check for follower counts displayed
-                follower_patterns = [
-                    r'(\d+[kKmM]?)\s*followers?',
-                    r'(\d+[kKmM]?)\s*subscribers?',
-                    r'(\d+[kKmM]?)\s*members?',
-                    r'trusted by\s*(\d+[kKmM]?)',
-                    r'(\d+[kKmM]?)\s*customers?'
-                ]
-                
-                for pattern in follower_patterns:
-                    matches = re.findall(pattern, text_lower)
+                for pattern in FOLLOWER_PATTERNS:
+                    matches = pattern.findall(text_lower)
                     if matches:
                         social_proof.append({
                             "type": "follower_count",
@@ -144,11 +146,14 @@ class SocialAnalyzer:
                         break
                 
                 # Check for client logos
-                logo_sections = soup.find_all(class_=re.compile(r'logos?|clients?|partners?|trusted', re.I))
-                if logo_sections:
+                logo_section = next(
+                    (node for node in tree.css('[class]') if _LOGO_CLASS_RE.search(node.attributes.get('class') or '')),
+                    None
+                )
+                if logo_section:
                     social_proof.append({
                         "type": "client_logos",
-                        "count": len(logo_sections[0].find_all('img'))
+                        "count": len(logo_section.css('img'))
                     })
                 
                 # Check for social media feeds
@@ -175,27 +180,27 @@ class SocialAnalyzer:
         try:
             async with httpx.AsyncClient() as client:
                 response = await client.get(f"https://{domain}", timeout=10.0)
-                soup = BeautifulSoup(response.text, 'lxml')
+                tree = LexborHTMLParser(response.text)
                 
                 meta_tags = {}
                 
                 # Open Graph tags
-                og_tags = soup.find_all('meta', property=re.compile(r'^og:'))
+                og_tags = tree.css('meta[property^="og:"]')
                 if og_tags:
                     meta_tags["open_graph"] = {
                         "present": True,
-                        "tags": [tag.get('property') for tag in og_tags[:5]]
+                        "tags": [tag.attributes.get('property') for tag in og_tags[:5]]
                     }
                 else:
                     meta_tags["open_graph"] = {"present": False}
                 
                 # Twitter Card tags
-                twitter_tags = soup.find_all('meta', attrs={'name': re.compile(r'^twitter:')})
+                twitter_tags = tree.css('meta[name^="twitter:"]')
                 if twitter_tags:
                     meta_tags["twitter_card"] = {
                         "present": True,
-                        "type": next((tag.get('content') for tag in twitter_tags 
-                                     if tag.get('name') == 'twitter:card'), 'summary')
+                        "type": next((tag.attributes.get('content') for tag in twitter_tags 
+                                     if tag.attributes.get('name') == 'twitter:card'), 'summary')
                     }
                 else:
                     meta_tags["twitter_card"] = {"present": False}
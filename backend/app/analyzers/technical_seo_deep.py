@@ -5,12 +5,14 @@ Goes beyond basic meta tags to find real technical SEO issues
 
 import httpx
 import asyncio
-from typing import Dict, Any, List, Optional, Set
+import heapq
+import time
+from typing import Dict, Any, List, Optional, Set, Tuple, Awaitable
 import re
 import json
 import structlog
 from bs4 import BeautifulSoup
-from urllib.parse import urljoin, urlparse, parse_qs
+from urllib.parse import urljoin, parse_qs
 import xml.etree.ElementTree as ET
 from collections import defaultdict
 from datetime import datetime
@@ -19,6 +21,40 @@ from app.utils.cache import cache_result, get_cached_result
 
 logger = structlog.get_logger()
 
+# Sort rank and health-score deduction per issue severity
+SEVERITY_ORDER = {"critical": 0, "high": 1, "medium": 2, "low": 3}
+SEVERITY_DEDUCTIONS = {
+    "critical": 15,
+    "high": 10,
+    "medium": 5,
+    "low": 2
+}
+
+# Technical debt weight per issue category; each category contributes at most 20
+TECHNICAL_DEBT_WEIGHTS = {
+    "canonical_issues": 2,
+    "hreflang_issues": 3,
+    "sitemap_issues": 2,
+    "redirect_issues": 3,
+    "javascript_seo_issues": 4,
+    "structured_data_issues": 2,
+    "indexability_issues": 4,
+    "orphan_pages": 2,
+    "duplicate_content": 1,
+    "crawl_budget_waste": 1
+}
+
+# Scheme and network location of an absolute URL, without a full urlparse
+_URL_SCHEME_HOST_RE = re.compile(r"([A-Za-z][A-Za-z0-9+.-]*)://([^/?#]*)")
+# ISO 639-1 language with optional ISO 3166-1 region, e.g. "en" or "en-GB"
+_HREFLANG_CODE_RE = re.compile(r'^[a-z]{2}(-[A-Z]{2})?$')
+
+SITEMAP_NS = "{http://www.sitemaps.org/schemas/sitemap/0.9}"
+# Leading <url> entries checked for a lastmod date
+SITEMAP_LASTMOD_SAMPLE = 10
+# Protocol limit for an uncompressed sitemap; downloads stop past it
+SITEMAP_MAX_BYTES = 50 * 1024 * 1024
+
 
 class TechnicalSEODeepAnalyzer:
     """
@@ -75,51 +111,30 @@ class TechnicalSEODeepAnalyzer:
                 crawl_results = await self._crawl_site_structure(domain, client)
                 results["crawl_stats"] = crawl_results["stats"]
                 
-                # Analyze each area in parallel
-                tasks = [
-                    self._analyze_indexability(crawl_results, client),
-                    self._analyze_canonicals(crawl_results, client),
-                    self._analyze_hreflang(crawl_results, client),
-                    self._validate_sitemap(domain, crawl_results, client),
-                    self._analyze_internal_linking(crawl_results),
-                    self._detect_redirect_chains(crawl_results, client),
-                    self._analyze_javascript_seo(crawl_results, client),
-                    self._validate_structured_data(crawl_results, client),
-                    self._analyze_core_web_vitals_by_template(crawl_results, domain),
-                    self._find_duplicate_content(crawl_results),
-                    self._analyze_crawl_budget(crawl_results)
-                ]
-                
-                analysis_results = await asyncio.gather(*tasks, return_exceptions=True)
+                # Analyze each area in parallel, filling results as each check finishes
+                checks = {
+                    "indexability_issues": self._analyze_indexability(crawl_results, client),
+                    "canonical_issues": self._analyze_canonicals(crawl_results, client),
+                    "hreflang_issues": self._analyze_hreflang(crawl_results, client),
+                    "sitemap_issues": self._validate_sitemap(domain, crawl_results, client),
+                    "internal_linking_issues": self._analyze_internal_linking(crawl_results),
+                    "redirect_issues": self._detect_redirect_chains(crawl_results, client),
+                    "javascript_seo_issues": self._analyze_javascript_seo(crawl_results, client),
+                    "structured_data_issues": self._validate_structured_data(crawl_results, client),
+                    "core_web_vitals_by_template": self._analyze_core_web_vitals_by_template(crawl_results, domain),
+                    "duplicate_content": self._find_duplicate_content(crawl_results),
+                    "crawl_budget_waste": self._analyze_crawl_budget(crawl_results)
+                }
                 
-                # Process results
-                for i, result in enumerate(analysis_results):
-                    if isinstance(result, Exception):
-                        logger.error(f"Technical SEO task {i} failed", error=str(result))
+                for finished in asyncio.as_completed([self._run_check(key, check) for key, check in checks.items()]):
+                    key, result = await finished
+                    if result is None:
+                        continue
+                    if key == "internal_linking_issues":
+                        results[key] = result.get("issues", [])
+                        results["orphan_pages"] = result.get("orphan_pages", [])
                     else:
-                        if i == 0:  # Indexability
-                            results["indexability_issues"] = result
-                        elif i == 1:  # Canonicals
-                            results["canonical_issues"] = result
-                        elif i == 2:  # Hreflang
-                            results["hreflang_issues"] = result
-                        elif i == 3:  # Sitemap
-                            results["sitemap_issues"] = result
-                        elif i == 4:  # Internal linking
-                            results["internal_linking_issues"] = result.get("issues", [])
-                            results["orphan_pages"] = result.get("orphan_pages", [])
-                        elif i == 5:  # Redirects
-                            results["redirect_issues"] = result
-                        elif i == 6:  # JavaScript SEO
-                            results["javascript_seo_issues"] = result
-                        elif i == 7:  # Structured data
-                            results["structured_data_issues"] = result
-                        elif i == 8:  # Core Web Vitals
-                            results["core_web_vitals_by_template"] = result
-                        elif i == 9:  # Duplicate content
-                            results["duplicate_content"] = result
-                        elif i == 10:  # Crawl budget
-                            results["crawl_budget_waste"] = result
+                        results[key] = result
                 
                 # Calculate scores and priorities
                 results["technical_debt_score"] = self._calculate_technical_debt(results)
@@ -134,6 +149,17 @@ class TechnicalSEODeepAnalyzer:
         
         return results
     
+    async def _run_check(self, key: str, check: Awaitable[Any]) -> Tuple[str, Any]:
+        """Await a single analysis check, tagging its result with the results key it fills"""
+        start = time.perf_counter()
+        try:
+            return key, await check
+        except Exception as e:
+            logger.error(f"Technical SEO check {key} failed", error=str(e))
+            return key, None
+        finally:
+            logger.debug(f"Technical SEO check {key} finished", elapsed=round(time.perf_counter() - start, 3))
+    
     async def _crawl_site_structure(self, domain: str, client: httpx.AsyncClient) -> Dict[str, Any]:
         """Crawl site to understand structure and find all pages"""
         crawled_urls = set()
@@ -208,13 +234,15 @@ class TechnicalSEODeepAnalyzer:
                     for link in soup.find_all('a', href=True):
                         href = link['href']
                         absolute_url = urljoin(url, href)
-                        parsed = urlparse(absolute_url)
+                        match = _URL_SCHEME_HOST_RE.match(absolute_url)
+                        if not match:
+                            continue
                         
-                        if parsed.netloc == domain:
+                        if match.group(2) == domain:
                             page_data["internal_links"].append(absolute_url)
                             if absolute_url not in crawled_urls and len(crawled_urls) < self.max_pages_to_crawl:
                                 to_crawl.add(absolute_url)
-                        elif parsed.scheme in ['http', 'https']:
+                        elif match.group(1).lower() in ('http', 'https'):
                             page_data["external_links"].append(absolute_url)
                     
                     # Images without alt
@@ -411,7 +439,7 @@ class TechnicalSEODeepAnalyzer:
                 # Check language codes
                 for tag in hreflang_tags:
                     lang = tag["lang"]
-                    if lang != "x-default" and not re.match(r'^[a-z]{2}(-[A-Z]{2})?$', lang):
+                    if lang != "x-default" and not _HREFLANG_CODE_RE.match(lang):
                         issues.append({
                             "type": "invalid_hreflang_code",
                             "url": url,
@@ -436,51 +464,57 @@ class TechnicalSEODeepAnalyzer:
         
         sitemap_found = False
         
-        for sitemap_url in sitemap_urls:
+        # Probe every location at once; the first one in list order that is
+        # served wins and the lower-priority probes still running are cancelled
+        probes = [asyncio.create_task(self._fetch_sitemap(sitemap_url, client)) for sitemap_url in sitemap_urls]
+        
+        for sitemap_url, probe in zip(sitemap_urls, probes):
             try:
-                response = await client.get(sitemap_url)
-                if response.status_code == 200:
+                sitemap = await probe
+                if sitemap is not None:
                     sitemap_found = True
+                    for other in probes:
+                        other.cancel()
                     
-                    # Parse XML
-                    try:
-                        root = ET.fromstring(response.text)
+                    if not sitemap["malformed"]:
+                        if sitemap["truncated"]:
+                            issues.append({
+                                "type": "sitemap_file_too_large",
+                                "url": sitemap_url,
+                                "severity": "high",
+                                "issue": "Sitemap file is over 50MB uncompressed",
+                                "impact": "Search engines ignore oversized sitemaps",
+                                "fix": "Split into multiple sitemaps"
+                            })
                         
                         # Check for sitemap index
-                        if 'sitemapindex' in root.tag:
+                        if sitemap["is_index"]:
                             # It's a sitemap index
-                            sitemaps = root.findall('.//{http://www.sitemaps.org/schemas/sitemap/0.9}sitemap')
-                            if len(sitemaps) > 50000:
+                            if sitemap["entry_count"] > 50000:
                                 issues.append({
                                     "type": "sitemap_too_large",
                                     "url": sitemap_url,
-                                    "count": len(sitemaps),
+                                    "count": sitemap["entry_count"],
                                     "severity": "medium",
-                                    "issue": f"Sitemap index has {len(sitemaps)} sitemaps (max 50,000)",
+                                    "issue": f"Sitemap index has {sitemap['entry_count']} sitemaps (max 50,000)",
                                     "impact": "Search engines may not process all",
                                     "fix": "Split into multiple sitemap indexes"
                                 })
                         else:
                             # Regular sitemap
-                            urls = root.findall('.//{http://www.sitemaps.org/schemas/sitemap/0.9}url')
-                            
-                            if len(urls) > 50000:
+                            if sitemap["entry_count"] > 50000:
                                 issues.append({
                                     "type": "sitemap_too_many_urls",
                                     "url": sitemap_url,
-                                    "count": len(urls),
+                                    "count": sitemap["entry_count"],
                                     "severity": "high",
-                                    "issue": f"Sitemap has {len(urls)} URLs (max 50,000)",
+                                    "issue": f"Sitemap has {sitemap['entry_count']} URLs (max 50,000)",
                                     "impact": "Exceeds sitemap limit",
                                     "fix": "Split into multiple sitemaps"
                                 })
                             
                             # Check for missing pages
-                            sitemap_url_set = set()
-                            for url_element in urls:
-                                loc = url_element.find('{http://www.sitemaps.org/schemas/sitemap/0.9}loc')
-                                if loc is not None:
-                                    sitemap_url_set.add(loc.text)
+                            sitemap_url_set = sitemap["locs"]
                             
                             # Compare with crawled pages
                             crawled_pages = set(crawl_results.get("pages", {}).keys())
@@ -516,19 +550,16 @@ class TechnicalSEODeepAnalyzer:
                                         pass
                             
                             # Check lastmod dates
-                            for url_element in urls[:10]:  # Sample check
-                                lastmod = url_element.find('{http://www.sitemaps.org/schemas/sitemap/0.9}lastmod')
-                                if lastmod is None:
-                                    issues.append({
-                                        "type": "missing_lastmod",
-                                        "severity": "low",
-                                        "issue": "Sitemap URLs missing lastmod date",
-                                        "impact": "Search engines can't prioritize fresh content",
-                                        "fix": "Add lastmod dates to sitemap"
-                                    })
-                                    break
+                            if sitemap["sample_missing_lastmod"]:
+                                issues.append({
+                                    "type": "missing_lastmod",
+                                    "severity": "low",
+                                    "issue": "Sitemap URLs missing lastmod date",
+                                    "impact": "Search engines can't prioritize fresh content",
+                                    "fix": "Add lastmod dates to sitemap"
+                                })
                     
-                    except ET.ParseError:
+                    else:
                         issues.append({
                             "type": "invalid_sitemap_xml",
                             "url": sitemap_url,
@@ -542,6 +573,12 @@ class TechnicalSEODeepAnalyzer:
             
             except Exception as e:
                 logger.debug(f"Error checking sitemap {sitemap_url}: {e}")
+                if sitemap_found:
+                    # Remaining probes were cancelled once this one was served
+                    break
+        
+        # Reap cancelled or failed probes so none is left unretrieved
+        await asyncio.gather(*probes, return_exceptions=True)
         
         if not sitemap_found:
             issues.append({
@@ -554,6 +591,63 @@ class TechnicalSEODeepAnalyzer:
         
         return issues
     
+    async def _fetch_sitemap(self, sitemap_url: str, client: httpx.AsyncClient) -> Optional[Dict[str, Any]]:
+        """Summarize a sitemap as it downloads; None when it is not served.
+        
+        Entries are freed as soon as they close and the download stops at
+        SITEMAP_MAX_BYTES, so memory stays flat however large the file is.
+        """
+        summary = {
+            "is_index": False,
+            "entry_count": 0,
+            "locs": set(),
+            "sample_missing_lastmod": False,
+            "truncated": False,
+            "malformed": False
+        }
+        parser = ET.XMLPullParser(events=("start", "end"))
+        entry_tag = SITEMAP_NS + "url"
+        root = None
+        received = 0
+        
+        async with client.stream("GET", sitemap_url) as response:
+            if response.status_code != 200:
+                return None
+            
+            try:
+                async for chunk in response.aiter_bytes(65536):
+                    received += len(chunk)
+                    if received > SITEMAP_MAX_BYTES:
+                        summary["truncated"] = True
+                        break
+                    parser.feed(chunk)
+                    
+                    for event, element in parser.read_events():
+                        if root is None:
+                            root = element
+                            if 'sitemapindex' in root.tag:
+                                summary["is_index"] = True
+                                entry_tag = SITEMAP_NS + "sitemap"
+                            continue
+                        if event != "end" or element.tag != entry_tag:
+                            continue
+                        
+                        summary["entry_count"] += 1
+                        if not summary["is_index"]:
+                            loc = element.find(SITEMAP_NS + "loc")
+                            if loc is not None:
+                                summary["locs"].add(loc.text)
+                            if (summary["entry_count"] <= SITEMAP_LASTMOD_SAMPLE
+                                    and element.find(SITEMAP_NS + "lastmod") is None):
+                                summary["sample_missing_lastmod"] = True
+                        root.clear()
+                else:
+                    parser.close()
+            except ET.ParseError:
+                summary["malformed"] = True
+        
+        return summary
+    
     async def _analyze_internal_linking(self, crawl_results: Dict) -> Dict[str, Any]:
         """Analyze internal link structure"""
         pages = crawl_results.get("pages", {})
@@ -935,26 +1029,12 @@ class TechnicalSEODeepAnalyzer:
     
     def _calculate_technical_debt(self, results: Dict) -> int:
         """Calculate technical debt score (0-100, higher is worse)"""
-        score = 0
-        
-        # Weight different issue types
-        weights = {
-            "canonical_issues": 2,
-            "hreflang_issues": 3,
-            "sitemap_issues": 2,
-            "redirect_issues": 3,
-            "javascript_seo_issues": 4,
-            "structured_data_issues": 2,
-            "indexability_issues": 4,
-            "orphan_pages": 2,
-            "duplicate_content": 1,
-            "crawl_budget_waste": 1
-        }
-        
-        for issue_type, weight in weights.items():
-            issues = results.get(issue_type, [])
-            if isinstance(issues, list):
-                score += min(len(issues) * weight, 20)  # Cap each category
+        # Weight different issue types in one pass over the categories
+        score = sum(
+            min(len(issues) * weight, 20)  # Cap each category
+            for issue_type, weight in TECHNICAL_DEBT_WEIGHTS.items()
+            if isinstance(issues := results.get(issue_type), list)
+        )
         
         return min(score, 100)
     
@@ -979,28 +1059,18 @@ class TechnicalSEODeepAnalyzer:
                         })
         
         # Sort by severity
-        severity_order = {"critical": 0, "high": 1, "medium": 2, "low": 3}
-        all_fixes.sort(key=lambda x: severity_order.get(x["severity"], 3))
-        
-        return all_fixes[:10]  # Top 10 priorities
+        return heapq.nsmallest(10, all_fixes, key=lambda x: SEVERITY_ORDER.get(x["severity"], 3))  # Top 10 priorities
     
     def _calculate_health_score(self, results: Dict) -> int:
         """Calculate overall SEO health score (0-100, higher is better)"""
         score = 100
         
         # Deduct points for issues
-        deductions = {
-            "critical": 15,
-            "high": 10,
-            "medium": 5,
-            "low": 2
-        }
-        
         for issue_type in results:
             if isinstance(results[issue_type], list):
                 for issue in results[issue_type]:
                     if isinstance(issue, dict):
                         severity = issue.get("severity", "low")
-                        score -= deductions.get(severity, 0)
+                        score -= SEVERITY_DEDUCTIONS.get(severity, 0)
         
         return max(0, score)
\ No newline at end of file
@@ -11,6 +11,20 @@ from app.utils.cache import cache_result, get_cached_result
 
 logger = structlog.get_logger()
 
+# Homepage signal patterns, compiled once at import
+_BLOG_LINK_RE = re.compile(r'/blog|/news|/articles', re.I)
+_BLOG_NEWS_LINK_RE = re.compile(r'/blog|/news', re.I)
+_SOCIAL_LINK_RE = re.compile(r'twitter|facebook|linkedin', re.I)
+_ANALYTICS_RE = re.compile(r'google-analytics|gtag|ga\(')
+_PIXEL_RE = re.compile(r'facebook|pixel|fbq')
+
+# Post date formats used to gauge blog publishing activity
+_POST_DATE_PATTERNS = (
+    re.compile(r'\d{4}-\d{2}-\d{2}'),
+    re.compile(r'\d{1,2}/\d{1,2}/\d{4}'),
+    re.compile(r'(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{1,2},?\s+\d{4}')
+)
+
 
 class TrafficAnalyzer:
     """Analyzes website traffic, rankings, and authority metrics"""
@@ -67,8 +81,8 @@ class TrafficAnalyzer:
                     "has_sitemap": await self._check_sitemap(domain, client),
                     "page_count": len(soup.find_all(['a'], href=True)),
                     "content_depth": len(soup.get_text()) > 5000,
-                    "has_blog": bool(soup.find_all(href=re.compile(r'/blog|/news|/articles', re.I))),
-                    "social_links": len(soup.find_all('a', href=re.compile(r'twitter|facebook|linkedin', re.I)))
+                    "has_blog": bool(soup.find_all(href=_BLOG_LINK_RE)),
+                    "social_links": len(soup.find_all('a', href=_SOCIAL_LINK_RE))
                 }
                 
                 # Calculate authority score (0-100)
@@ -106,8 +120,8 @@ class TrafficAnalyzer:
                 
                 # Check for traffic signals
                 signals = {
-                    "has_analytics": bool(re.search(r'google-analytics|gtag|ga\(', response.text)),
-                    "has_pixels": bool(re.search(r'facebook|pixel|fbq', response.text)),
+                    "has_analytics": bool(_ANALYTICS_RE.search(response.text)),
+                    "has_pixels": bool(_PIXEL_RE.search(response.text)),
                     "page_size": len(response.text),
                     "images": len(soup.find_all('img')),
                     "scripts": len(soup.find_all('script'))
@@ -143,7 +157,7 @@ class TrafficAnalyzer:
                     multiplier *= 1.05
                 
                 # Check for blog activity
-                if soup.find_all(['a'], href=re.compile(r'/blog|/news', re.I)):
+                if soup.find_all(['a'], href=_BLOG_NEWS_LINK_RE):
                     multiplier *= 1.25
                 
                 # Check for e-commerce signals
@@ -215,7 +229,7 @@ class TrafficAnalyzer:
                 soup = BeautifulSoup(response.text, 'lxml')
                 
                 # Find blog links
-                blog_links = soup.find_all('a', href=re.compile(r'/blog|/news|/articles', re.I))
+                blog_links = soup.find_all('a', href=_BLOG_LINK_RE)
                 
                 if blog_links:
                     # Try to fetch blog page
@@ -227,15 +241,9 @@ class TrafficAnalyzer:
                     blog_soup = BeautifulSoup(blog_response.text, 'lxml')
                     
                     # Look for dates in blog posts
-                    date_patterns = [
-                        r'\d{4}-\d{2}-\d{2}',
-                        r'\d{1,2}/\d{1,2}/\d{4}',
-                        r'(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{1,2},?\s+\d{4}'
-                    ]
-                    
                     dates_found = []
-                    for pattern in date_patterns:
-                        dates = re.findall(pattern, blog_response.text)
+                    for pattern in _POST_DATE_PATTERNS:
+                        dates = pattern.findall(blog_response.text)
                         dates_found.extend(dates[:10])  # Get recent dates
                     
                     if dates_found:
@@ -3,6 +3,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, desc
 import json
 import asyncio
+import time
 import structlog
 from typing import Dict, Set, Optional
 from uuid import UUID, uuid4
@@ -306,8 +307,7 @@ async def websocket_endpoint(
                             
                             # Run analysis with new database session
                             from app.database import get_db_context
-                            import time
-                            analysis_start_time = time.time()
+                            analysis_start_time = time.perf_counter()
                             
                             try:
                                 async with get_db_context() as db:
@@ -320,7 +320,7 @@ async def websocket_endpoint(
                                     )
                                 
                                 # Track successful analysis
-                                analysis_duration = time.time() - analysis_start_time
+                                analysis_duration = time.perf_counter() - analysis_start_time
                                 # Handle both dict and object types
                                 if hasattr(analysis_result, 'issues'):
                                     issues_count = len(analysis_result.issues) if analysis_result.issues else 0
@@ -338,7 +338,7 @@ async def websocket_endpoint(
                                 )
                             except Exception as e:
                                 # Track failed analysis
-                                analysis_duration = time.time() - analysis_start_time
+                                analysis_duration = time.perf_counter() - analysis_start_time
                                 Analytics.track_analysis(
                                     domain=domain,
                                     conversation_id=str(conversation.id),
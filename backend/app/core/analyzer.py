@@ -1,5 +1,6 @@
 import asyncio
 import httpx
+import time
 from typing import Optional, Dict, Any, Callable, List
 from datetime import datetime, timezone
 from uuid import UUID
@@ -313,39 +314,16 @@ class DomainAnalyzer:
         # Content strategy analysis (pass competitors if found)
         # Will be handled after initial results
         
-        # Track analyzer execution with timing
-        import time
-        analyzer_timings = {}
-        
-        # Run all analyzers and track timing
-        start_times = [time.time() for _ in tasks]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        # Track each analyzer's performance
-        for i, (result, name) in enumerate(zip(results, analyzer_names)):
-            duration = time.time() - start_times[0]  # Approximate since they run in parallel
-            success = not isinstance(result, Exception)
-            error = str(result) if isinstance(result, Exception) else None
-            
-            Analytics.track_analyzer_performance(
-                analyzer_name=name,
-                domain=domain,
-                duration=duration,
-                success=success,
-                error=error
-            )
+        # Run all analyzers; each one records its own timing and turns a failure
+        # into an error entry, so a failing analyzer never cancels its siblings
+        async with asyncio.TaskGroup() as tg:
+            running = {
+                name: tg.create_task(self._run_tracked(name, domain, coro))
+                for name, coro in zip(analyzer_names, tasks)
+            }
         
         # Combine results
-        combined = {}
-        for i, key in enumerate(analyzer_names):
-            if i < len(results) and not isinstance(results[i], Exception):
-                combined[key] = results[i]
-            else:
-                if i < len(results):
-                    logger.error(f"{key} analysis failed", error=str(results[i]))
-                    combined[key] = {"error": str(results[i])}
-                else:
-                    combined[key] = {}
+        combined = {name: task.result() for name, task in running.items()}
         
         # Run content strategy analysis with competitor data
         if combined.get("competitors", {}).get("competitors"):
@@ -392,6 +370,26 @@ class DomainAnalyzer:
         
         return combined
     
+    async def _run_tracked(self, name: str, domain: str, coro) -> Dict[str, Any]:
+        """Await one analyzer, tracking its duration and outcome"""
+        start = time.perf_counter()
+        error = None
+        try:
+            result = await coro
+        except Exception as e:
+            error = str(e)
+            logger.error(f"{name} analysis failed", error=error)
+            result = {"error": error}
+        
+        Analytics.track_analyzer_performance(
+            analyzer_name=name,
+            domain=domain,
+            duration=time.perf_counter() - start,
+            success=error is None,
+            error=error
+        )
+        return result
+    
     async def _run_with_update(
         self,
         coro,
@@ -437,12 +435,19 @@ class DomainAnalyzer:
                 return Industry.OTHER
     
     async def _get_industry_benchmarks(self, industry: Industry) -> Dict[str, Any]:
+        # Benchmarks change rarely and are identical for every domain in an
+        # industry, so serve repeats from the cache instead of the database
+        cache_key = f"benchmarks:{industry.value}"
+        cached = await get_cached_result(cache_key)
+        if cached:
+            return cached
+        
         result = await self.db.execute(
             select(IndustryBenchmark).where(IndustryBenchmark.industry == industry)
         )
         benchmarks = result.scalars().all()
         
-        return {
+        industry_benchmarks = {
             b.metric_type.value: {
                 "p25": b.p25_value,
                 "p50": b.p50_value,
@@ -451,6 +456,11 @@ class DomainAnalyzer:
             }
             for b in benchmarks
         }
+        
+        if industry_benchmarks:
+            await cache_result(cache_key, industry_benchmarks, ttl=3600)
+        
+        return industry_benchmarks
     
     def _clean_domain(self, domain: str) -> str:
         domain = domain.lower().strip()
@@ -1,5 +1,7 @@
 from typing import Dict, Any, List, Tuple
 from dataclasses import dataclass
+import heapq
+from operator import attrgetter
 import structlog
 
 from app.models.analysis import Industry
@@ -7,7 +9,7 @@ from app.models.analysis import Industry
 logger = structlog.get_logger()
 
 
-@dataclass
+@dataclass(slots=True)
 class Issue:
     category: str
     severity: str  # critical, high, medium, low
@@ -21,7 +23,7 @@ class Issue:
     competitor_advantage: str  # How competitors handle this
 
 
-@dataclass
+@dataclass(slots=True)
 class QuickWin:
     title: str
     current_state: str
@@ -104,13 +106,10 @@ class MetricsCalculator:
             issues.extend(seo_issues)
             quick_wins.extend(seo_wins)
         
-        # Sort by impact score
-        issues.sort(key=lambda x: x.impact_score if hasattr(x, 'impact_score') else 0, reverse=True)
-        quick_wins.sort(key=lambda x: x.impact_score if hasattr(x, 'impact_score') else 0, reverse=True)
-        
-        # Convert to dicts
-        issues_dict = [self._issue_to_dict(i) for i in issues[:10]]  # Top 10
-        wins_dict = [self._win_to_dict(w) for w in quick_wins[:5]]  # Top 5
+        # Highest impact first; only the kept items are converted to dicts
+        by_impact = attrgetter("impact_score")
+        issues_dict = [self._issue_to_dict(i) for i in heapq.nlargest(10, issues, key=by_impact)]  # Top 10
+        wins_dict = [self._win_to_dict(w) for w in heapq.nlargest(5, quick_wins, key=by_impact)]  # Top 5
         
         return issues_dict, wins_dict
     
@@ -1,8 +1,12 @@
+import heapq
 from typing import Dict, List, Any, Optional
 import structlog
 
 logger = structlog.get_logger()
 
+# Sort rank for recommendation priorities; unknown priorities sort last
+PRIORITY_ORDER = {"critical": 0, "high": 1, "medium": 2, "low": 3}
+
 
 class RecommendationEngine:
     """Generate specific, actionable recommendations from analysis data"""
@@ -257,10 +261,7 @@ class RecommendationEngine:
                     })
         
         # Sort by priority
-        priority_order = {"critical": 0, "high": 1, "medium": 2, "low": 3}
-        recommendations.sort(key=lambda x: priority_order.get(x["priority"], 4))
-        
-        return recommendations[:10]  # Top 10 recommendations
+        return heapq.nsmallest(10, recommendations, key=lambda x: PRIORITY_ORDER.get(x["priority"], 4))  # Top 10 recommendations
     
     def generate_quick_wins(self, analysis_results: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Generate quick wins (< 1 day effort, high impact)"""
@@ -1,6 +1,6 @@
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from contextlib import asynccontextmanager
 import structlog
 import sentry_sdk
@@ -14,6 +14,7 @@ from app.api import websocket, analysis, share, test_ws, test_conversation, test
 # Import auth module
 from app.api import auth
 from app.utils.cache import init_redis
+from app.utils.http_client import close_http_client
 from app.integrations.google_ads import google_ads_router
 
 # Configure structured logging
@@ -57,6 +58,7 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down Keelo.ai")
+    await close_http_client()
     await engine.dispose()
 
 
@@ -77,6 +79,7 @@ app = FastAPI(
     title=settings.APP_NAME,
     version=settings.APP_VERSION,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     docs_url="/docs" if settings.DEBUG else None,
     redoc_url="/redoc" if settings.DEBUG else None,
 )
@@ -1,5 +1,6 @@
 """Context-aware chat service for personalized responses."""
 
+from bisect import bisect_left
 from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -16,6 +17,9 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Percentile reported for a value at or below each benchmark threshold (p10..p90), then above p90
+PERCENTILE_BANDS = (10, 25, 50, 75, 90, 95)
+
 
 class ContextAwareChat:
     """Provides context-aware responses based on user history and monitoring data."""
@@ -817,18 +821,15 @@ class ContextAwareChat:
     
     def _calculate_percentile(self, value: float, benchmark: GrowthBenchmark) -> int:
         """Calculate percentile position based on benchmark."""
-        if value <= benchmark.p10_value:
-            return 10
-        elif value <= benchmark.p25_value:
-            return 25
-        elif value <= benchmark.median_value:
-            return 50
-        elif value <= benchmark.p75_value:
-            return 75
-        elif value <= benchmark.p90_value:
-            return 90
-        else:
-            return 95
+        thresholds = (
+            benchmark.p10_value,
+            benchmark.p25_value,
+            benchmark.median_value,
+            benchmark.p75_value,
+            benchmark.p90_value
+        )
+        # First band whose threshold is >= value; past p90 falls into the top band
+        return PERCENTILE_BANDS[bisect_left(thresholds, value)]
     
     def _generate_comparison_insights(self, snapshots: Dict[str, SiteSnapshot]) -> str:
         """Generate insights from comparison."""
@@ -43,6 +43,15 @@ class WebsiteMonitor:
         # Parse content
         soup = BeautifulSoup(content, 'html.parser')
         
+        # Classify links in a single pass
+        internal_links = external_links = 0
+        for a in soup.find_all('a', href=True):
+            href = a['href']
+            if domain in href or href.startswith('/'):
+                internal_links += 1
+            elif href.startswith('http'):
+                external_links += 1
+        
         # Extract metrics
         snapshot = SiteSnapshot(
             domain=domain,
@@ -60,10 +69,8 @@ class WebsiteMonitor:
             
             # SEO metrics
             word_count=len(soup.get_text().split()),
-            internal_links=len([a for a in soup.find_all('a', href=True) 
-                               if domain in a['href'] or a['href'].startswith('/')]),
-            external_links=len([a for a in soup.find_all('a', href=True) 
-                               if domain not in a['href'] and a['href'].startswith('http')]),
+            internal_links=internal_links,
+            external_links=external_links,
             
             # Content hash for change detection
             content_hash=hashlib.md5(content.encode()).hexdigest(),
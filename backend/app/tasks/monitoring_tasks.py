@@ -8,6 +8,7 @@ from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
 from app.services.monitoring import MonitoringScheduler
+from app.utils.http_client import close_http_client
 import logging
 
 logger = logging.getLogger(__name__)
@@ -34,6 +35,8 @@ def monitor_websites():
     try:
         loop.run_until_complete(run_monitoring())
     finally:
+        # The shared HTTP client is bound to this loop; release its pooled sockets
+        loop.run_until_complete(close_http_client())
         loop.close()
     
     return {"status": "completed", "timestamp": datetime.utcnow().isoformat()}
@@ -55,6 +58,8 @@ def update_competitor_intelligence():
     try:
         loop.run_until_complete(run_update())
     finally:
+        # The shared HTTP client is bound to this loop; release its pooled sockets
+        loop.run_until_complete(close_http_client())
         loop.close()
     
     return {"status": "completed", "timestamp": datetime.utcnow().isoformat()}
@@ -133,6 +138,8 @@ def populate_benchmarks():
     try:
         loop.run_until_complete(run_populate())
     finally:
+        # The shared HTTP client is bound to this loop; release its pooled sockets
+        loop.run_until_complete(close_http_client())
         loop.close()
     
     return {"status": "completed", "timestamp": datetime.utcnow().isoformat()}
\ No newline at end of file
@@ -215,7 +215,7 @@ def track_performance(func):
     """Decorator to track function performance"""
     @wraps(func)
     async def async_wrapper(*args, **kwargs):
-        start_time = time.time()
+        start_time = time.perf_counter()
         error = None
         result = None
         
@@ -226,7 +226,7 @@ def track_performance(func):
             error = str(e)
             raise
         finally:
-            duration = (time.time() - start_time) * 1000  # Convert to ms
+            duration = (time.perf_counter() - start_time) * 1000  # Convert to ms
             
             Analytics.track_event(
                 "function_executed",
@@ -240,7 +240,7 @@ def track_performance(func):
     
     @wraps(func)
     def sync_wrapper(*args, **kwargs):
-        start_time = time.time()
+        start_time = time.perf_counter()
         error = None
         result = None
         
@@ -251,7 +251,7 @@ def track_performance(func):
             error = str(e)
             raise
         finally:
-            duration = (time.time() - start_time) * 1000  # Convert to ms
+            duration = (time.perf_counter() - start_time) * 1000  # Convert to ms
             
             Analytics.track_event(
                 "function_executed",
@@ -313,7 +313,7 @@ class FeatureFlags:
 # Middleware for automatic request tracking
 async def track_request_middleware(request, call_next):
     """Middleware to automatically track API requests"""
-    start_time = time.time()
+    start_time = time.perf_counter()
     
     # Track request start
     Analytics.track_event(
@@ -327,7 +327,7 @@ async def track_request_middleware(request, call_next):
     
     try:
         response = await call_next(request)
-        duration = (time.time() - start_time) * 1000
+        duration = (time.perf_counter() - start_time) * 1000
         
         # Track request completion
         Analytics.track_api_request(
@@ -339,7 +339,7 @@ async def track_request_middleware(request, call_next):
         
         return response
     except Exception as e:
-        duration = (time.time() - start_time) * 1000
+        duration = (time.perf_counter() - start_time) * 1000
         
         # Track request error
         Analytics.track_api_request(
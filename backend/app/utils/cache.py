@@ -1,6 +1,10 @@
 import redis.asyncio as redis
-import json
-from typing import Any, Optional
+import orjson
+import time
+import zstandard as zstd
+from collections import OrderedDict
+from fnmatch import fnmatchcase
+from typing import Any, Optional, Tuple
 import structlog
 
 from app.config import settings
@@ -9,10 +13,62 @@ logger = structlog.get_logger()
 
 # Global Redis client
 redis_client: Optional[redis.Redis] = None
+# Binary-safe client for cache_result/get_cached_result, whose payloads may be compressed
+_cache_client: Optional[redis.Redis] = None
+
+# Analysis results run to tens of KB of JSON; compress anything past this size
+COMPRESS_MIN_BYTES = 1024
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+_compressor = zstd.ZstdCompressor(level=3)
+_decompressor = zstd.ZstdDecompressor()
+
+# In-process L1 cache in front of Redis: key -> (expires_at, serialized value)
+L1_MAX_ENTRIES = 128
+L1_MAX_TTL = 300
+_l1_cache: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+
+
+def _l1_get(key: str) -> Optional[bytes]:
+    entry = _l1_cache.get(key)
+    if entry is None:
+        return None
+    expires_at, serialized = entry
+    if expires_at <= time.monotonic():
+        del _l1_cache[key]
+        return None
+    _l1_cache.move_to_end(key)
+    return serialized
+
+
+def _l1_set(key: str, serialized: bytes, ttl: int) -> None:
+    _l1_cache[key] = (time.monotonic() + min(ttl, L1_MAX_TTL), serialized)
+    _l1_cache.move_to_end(key)
+    if len(_l1_cache) > L1_MAX_ENTRIES:
+        _l1_cache.popitem(last=False)
+
+
+def _deserialize(value: bytes) -> Any:
+    try:
+        return orjson.loads(value)
+    except orjson.JSONDecodeError:
+        return value.decode()
+
+
+def _compress(serialized: bytes) -> bytes:
+    if len(serialized) < COMPRESS_MIN_BYTES:
+        return serialized
+    return _compressor.compress(serialized)
+
+
+def _decompress(stored: bytes) -> bytes:
+    # Entries written before compression, or below the threshold, are plain JSON
+    if stored.startswith(_ZSTD_MAGIC):
+        return _decompressor.decompress(stored)
+    return stored
 
 
 async def init_redis():
-    global redis_client
+    global redis_client, _cache_client
     try:
         redis_client = redis.from_url(
             settings.REDIS_URL,
@@ -20,10 +76,12 @@ async def init_redis():
             decode_responses=True
         )
         await redis_client.ping()
+        _cache_client = redis.from_url(settings.REDIS_URL)
         logger.info("Redis connected successfully")
     except Exception as e:
         logger.error("Failed to connect to Redis", error=str(e))
         redis_client = None
+        _cache_client = None
 
 
 async def get_redis() -> Optional[redis.Redis]:
@@ -31,13 +89,14 @@ async def get_redis() -> Optional[redis.Redis]:
 
 
 async def cache_result(key: str, value: Any, ttl: int = None) -> bool:
-    if not redis_client:
+    if not _cache_client:
         return False
     
     try:
         ttl = ttl or settings.CACHE_TTL
-        serialized = json.dumps(value) if not isinstance(value, str) else value
-        await redis_client.setex(key, ttl, serialized)
+        serialized = orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS) if not isinstance(value, str) else value.encode()
+        await _cache_client.setex(key, ttl, _compress(serialized))
+        _l1_set(key, serialized, ttl)
         return True
     except Exception as e:
         logger.error("Cache set failed", key=key, error=str(e))
@@ -45,16 +104,22 @@ async def cache_result(key: str, value: Any, ttl: int = None) -> bool:
 
 
 async def get_cached_result(key: str) -> Optional[Any]:
-    if not redis_client:
+    if not _cache_client:
         return None
     
+    # Stored serialized so callers always get a fresh copy they are free to mutate
+    serialized = _l1_get(key)
+    if serialized is not None:
+        return _deserialize(serialized)
+    
     try:
-        value = await redis_client.get(key)
+        async with _cache_client.pipeline(transaction=False) as pipe:
+            value, ttl = await pipe.get(key).ttl(key).execute()
         if value:
-            try:
-                return json.loads(value)
-            except json.JSONDecodeError:
-                return value
+            serialized = _decompress(value)
+            if ttl > 0:
+                _l1_set(key, serialized, ttl)
+            return _deserialize(serialized)
     except Exception as e:
         logger.error("Cache get failed", key=key, error=str(e))
     
@@ -62,6 +127,7 @@ async def get_cached_result(key: str) -> Optional[Any]:
 
 
 async def delete_cache(key: str) -> bool:
+    _l1_cache.pop(key, None)
     if not redis_client:
         return False
     
@@ -74,6 +140,8 @@ async def delete_cache(key: str) -> bool:
 
 
 async def clear_pattern(pattern: str) -> int:
+    for key in [key for key in _l1_cache if fnmatchcase(key, pattern)]:
+        del _l1_cache[key]
     if not redis_client:
         return 0
     
@@ -0,0 +1,87 @@
+import asyncio
+import httpx
+from typing import Optional, Tuple
+import structlog
+
+from app.utils.cache import cache_result, get_cached_result
+
+logger = structlog.get_logger()
+
+# robots.txt rarely changes; several analyzers read it for the same domain
+ROBOTS_TXT_TTL = 600
+
+# Cap on page bytes read: <head> and the visible content fit comfortably,
+# multi-megabyte inlined SPA bundles are cut off instead of buffered
+MAX_PAGE_BYTES = 2_000_000
+
+# Process-wide client so analyzers reuse pooled keep-alive (and HTTP/2) connections
+http_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared client, creating it for the running event loop if needed.
+
+    Celery tasks run analyzers on their own short-lived loops, and pooled
+    connections cannot cross loops, so a new client is created per loop.
+    Whoever owns such a loop must await close_http_client() before closing it,
+    or the replaced client's keep-alive sockets are never released.
+    """
+    global http_client, _client_loop
+    loop = asyncio.get_running_loop()
+    if http_client is None or http_client.is_closed or _client_loop is not loop:
+        http_client = httpx.AsyncClient(
+            http2=True,
+            timeout=httpx.Timeout(30.0, connect=5.0),
+            limits=httpx.Limits(max_connections=200, max_keepalive_connections=50),
+            follow_redirects=True
+        )
+        _client_loop = loop
+    return http_client
+
+
+async def close_http_client():
+    global http_client, _client_loop
+    if http_client is None:
+        return
+    
+    try:
+        await http_client.aclose()
+    except Exception as e:
+        logger.error("Failed to close HTTP client", error=str(e))
+    finally:
+        http_client = None
+        _client_loop = None
+
+
+async def fetch_robots_txt(domain: str, timeout: float = 10.0) -> Optional[str]:
+    """Return the domain's robots.txt body lowercased, or None if it is not served.
+
+    Directives and agent names are case-insensitive, so callers only ever match
+    against the lowercased text. Both hits and misses are cached briefly so
+    repeat analyses skip the fetch.
+    """
+    cache_key = f"robots_txt:{domain}"
+    cached = await get_cached_result(cache_key)
+    if cached:
+        return cached["body"]
+    
+    response = await get_http_client().get(f"https://{domain}/robots.txt", timeout=timeout)
+    body = response.text.lower() if response.status_code == 200 else None
+    await cache_result(cache_key, {"body": body}, ttl=ROBOTS_TXT_TTL)
+    return body
+
+
+async def fetch_capped(url: str, max_bytes: int = MAX_PAGE_BYTES, timeout: float = 10.0) -> Tuple[int, bytes, str]:
+    """Stream a page body, stopping once max_bytes have been read.
+
+    Returns the status code, the body (truncated to max_bytes) and its encoding.
+    """
+    body = bytearray()
+    async with get_http_client().stream("GET", url, timeout=timeout) as response:
+        async for chunk in response.aiter_bytes():
+            body += chunk
+            if len(body) >= max_bytes:
+                break
+        encoding = response.encoding or 'utf-8'
+    return response.status_code, bytes(body[:max_bytes]), encoding